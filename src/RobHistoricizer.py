@@ -7,11 +7,16 @@ import tabula
 import difflib
 import numpy as np
 import inspect
-import sys
 import glob
+import gzip
+import shutil
 from copy import copy
+from itertools import chain
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
 from PyPDF2 import PdfFileReader
 from datetime import datetime, timezone
 from typing import Dict
@@ -25,6 +30,475 @@ from clearml import Dataset
 PROJECT_NAME = "rob-oliver"
 DATASET_NAME = "rob"
 PATH_TO_OUT = "../data/out"
+PATH_TO_CACHE = "../data/cache"
+EARTH_RADIUS_KM = 6371.0088
+GRID_CELL_SIZE_DEG = 0.1
+FINDING_PLACE_DUPLICATE_RADIUS_KM = 1.0
+AGGREGATE_KEYS = ["Monat", "Tierart", "Aktuell", "Fundort", "Lat", "Long"]
+CHUNK_SAMPLE_ROWS = 1000
+CHUNK_MEMORY_OVERHEAD = 4
+ROB_COLUMNS = [
+    "Sys_id",
+    "Fundort",
+    "Lat",
+    "Long",
+    "Einlieferungsdatum",
+    "Tierart",
+    "Aktuell",
+    "Erstellt_am",
+    "Sys_aktualisiert_am",
+    "Sys_hash",
+]
+ROB_SORT_KEYS = ["Einlieferungsdatum", "Tierart", "Fundort"]
+ROB_CURRENT_COLUMNS = [
+    "Fundort",
+    "Lat",
+    "Long",
+    "Einlieferungsdatum",
+    "Tierart",
+    "Aktuell",
+    "Erstellt_am",
+    "Sys_aktualisiert_am",
+]
+ROB_STATUSES = ["Reha", "Ausgewildert", "Verstorben"]
+ROB_TRANSITION_COLUMNS = [f"{status}_am" for status in ROB_STATUSES]
+ROB_LIFECYCLE_COLUMNS = (
+    ["Fundort", "Tierart", "Einlieferungsdatum"]
+    + ROB_TRANSITION_COLUMNS
+    + ["Reha_Tage"]
+)
+
+
+class FindingPlaceIndex:
+    def __init__(self, df_places: pd.DataFrame, cell_size: float = GRID_CELL_SIZE_DEG):
+        """
+        A spatial grid index over geo coordinates, e.g., over the catalogued finding places in
+        `catalogued_finding_places.csv` or the coordinates of admissions in `rob.csv`. Points are bucketed into square
+        grid cells of `cell_size` degrees, so that radius and nearest-neighbor queries only compute haversine distances
+        for points in the cells around the query location instead of scanning all points.
+
+        Parameters
+        ----------
+        df_places
+            A `pandas DataFrame` with columns `Lat` and `Long`, and optionally `Name`. Rows without coordinates are not
+            indexed.
+
+        cell_size
+            Edge length of a grid cell in degrees.
+        """
+        self.cell_size = cell_size
+
+        lat = df_places["Lat"].to_numpy(dtype="float64")
+        long = df_places["Long"].to_numpy(dtype="float64")
+        is_indexed = ~(np.isnan(lat) | np.isnan(long))
+        self.names = (
+            list(df_places["Name"].to_numpy()[is_indexed])
+            if "Name" in df_places.columns
+            else [None] * int(is_indexed.sum())
+        )
+        self.lat = lat[is_indexed]
+        self.long = long[is_indexed]
+
+        # Bucket the positions of all points by their grid cell at once
+        cell_lats = np.floor(self.lat / cell_size).astype("int64")
+        cell_longs = np.floor(self.long / cell_size).astype("int64")
+        positions_by_cell = (
+            pd.Series(np.arange(len(self.lat))).groupby([cell_lats, cell_longs]).indices
+            if len(self.lat) > 0
+            else {}
+        )
+        self.cells = {
+            (int(cell_lat), int(cell_long)): positions.tolist()
+            for (cell_lat, cell_long), positions in positions_by_cell.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _get_cell(self, lat: float, long: float) -> Tuple[int, int]:
+        return int(np.floor(lat / self.cell_size)), int(np.floor(long / self.cell_size))
+
+    def _add(self, name: str, lat: float, long: float) -> None:
+        if pd.isna(lat) or pd.isna(long):
+            return
+        self.cells.setdefault(self._get_cell(lat, long), []).append(len(self.names))
+        self.names.append(name)
+        self.lat = np.append(self.lat, float(lat))
+        self.long = np.append(self.long, float(long))
+
+    @staticmethod
+    def haversine(
+        lat: float, long: float, lats: np.ndarray, longs: np.ndarray
+    ) -> np.ndarray:
+        """
+        Computes the great-circle distances in kilometers between the point (`lat`, `long`) and the points
+        (`lats`, `longs`).
+
+        Parameters
+        ----------
+        lat
+            Latitude of the reference point in degrees.
+
+        long
+            Longitude of the reference point in degrees.
+
+        lats
+            Latitudes of the other points in degrees.
+
+        longs
+            Longitudes of the other points in degrees.
+
+        Returns
+        -------
+        A `numpy` array of distances in kilometers.
+        """
+        lat, long, lats, longs = map(np.radians, (lat, long, lats, longs))
+        a = (
+            np.sin((lats - lat) / 2) ** 2
+            + np.cos(lat) * np.cos(lats) * np.sin((longs - long) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def _get_candidates(self, lat: float, long: float, radius_km: float) -> np.ndarray:
+        """
+        Returns the positions of all indexed points in grid cells that intersect the bounding box of the circle with
+        radius `radius_km` around (`lat`, `long`).
+        """
+        delta_lat = np.degrees(radius_km / EARTH_RADIUS_KM)
+        max_abs_lat = min(abs(lat) + delta_lat, 90.0)
+        cos_lat = np.cos(np.radians(max_abs_lat))
+        delta_long = 180.0 if cos_lat < 1e-9 else min(delta_lat / cos_lat, 180.0)
+        if long - delta_long < -180.0 or long + delta_long >= 180.0:
+            # The bounding box wraps around the antimeridian: search the whole latitude band
+            delta_long = 180.0
+
+        lat_min, long_min = self._get_cell(lat - delta_lat, long - delta_long)
+        lat_max, long_max = self._get_cell(lat + delta_lat, long + delta_long)
+        num_cells = (lat_max - lat_min + 1) * (long_max - long_min + 1)
+
+        if delta_long >= 180.0 or num_cells > len(self.cells):
+            # The bounding box covers more cells than are occupied: filter the occupied cells instead
+            candidates = [
+                positions
+                for (cell_lat, cell_long), positions in self.cells.items()
+                if lat_min <= cell_lat <= lat_max
+                and (delta_long >= 180.0 or long_min <= cell_long <= long_max)
+            ]
+        else:
+            candidates = [
+                self.cells[(cell_lat, cell_long)]
+                for cell_lat in range(lat_min, lat_max + 1)
+                for cell_long in range(long_min, long_max + 1)
+                if (cell_lat, cell_long) in self.cells
+            ]
+        if len(candidates) == 0:
+            return np.empty(0, dtype="int64")
+        return np.concatenate(candidates).astype("int64")
+
+    def query_radius(
+        self, lat: float, long: float, radius_km: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds all indexed points within `radius_km` kilometers of (`lat`, `long`).
+
+        Parameters
+        ----------
+        lat
+            Latitude of the query location in degrees.
+
+        long
+            Longitude of the query location in degrees.
+
+        radius_km
+            Search radius in kilometers.
+
+        Returns
+        -------
+        A tuple of the positions of the found points (in insertion order of the index) and their distances in
+        kilometers, both sorted by ascending distance.
+        """
+        candidates = self._get_candidates(lat, long, radius_km)
+        distances = self.haversine(
+            lat, long, self.lat[candidates], self.long[candidates]
+        )
+        within_radius = distances <= radius_km
+        candidates, distances = candidates[within_radius], distances[within_radius]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
+
+    def query_nearest(
+        self, lat: float, long: float, k: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the `k` indexed points closest to (`lat`, `long`). The search radius starts at the size of a grid cell
+        and is doubled until at least `k` points are found.
+
+        Parameters
+        ----------
+        lat
+            Latitude of the query location in degrees.
+
+        long
+            Longitude of the query location in degrees.
+
+        k
+            Number of neighbors.
+
+        Returns
+        -------
+        A tuple of the positions of the found points (in insertion order of the index) and their distances in
+        kilometers, both sorted by ascending distance.
+        """
+        k = min(k, len(self))
+        radius_km = np.radians(self.cell_size) * EARTH_RADIUS_KM
+        while True:
+            positions, distances = self.query_radius(lat, long, radius_km)
+            if len(positions) >= k or radius_km >= np.pi * EARTH_RADIUS_KM:
+                return positions[:k], distances[:k]
+            radius_km *= 2
+
+    def find_near_duplicate(
+        self,
+        name: str,
+        lat: float,
+        long: float,
+        radius_km: float = FINDING_PLACE_DUPLICATE_RADIUS_KM,
+    ) -> int:
+        """
+        Finds an indexed finding place that has the same name as `name`, ignoring case and surrounding whitespace, and
+        lies within `radius_km` kilometers of (`lat`, `long`).
+
+        Parameters
+        ----------
+        name
+            Name of the finding place.
+
+        lat
+            Latitude of the finding place in degrees.
+
+        long
+            Longitude of the finding place in degrees.
+
+        radius_km
+            Maximum distance in kilometers between two entries of the same finding place.
+
+        Returns
+        -------
+        The position of the closest near-duplicate, or -1 if there is none.
+        """
+        if pd.isna(lat) or pd.isna(long):
+            return -1
+        normalized_name = str(name).strip().casefold()
+        for position in self.query_radius(lat, long, radius_km)[0]:
+            if str(self.names[position]).strip().casefold() == normalized_name:
+                return int(position)
+        return -1
+
+    def insert(
+        self,
+        name: str,
+        lat: float,
+        long: float,
+        duplicate_radius_km: float = FINDING_PLACE_DUPLICATE_RADIUS_KM,
+    ) -> bool:
+        """
+        Adds a finding place to the index unless it is a near-duplicate of an already indexed one (see
+        `find_near_duplicate`).
+
+        Parameters
+        ----------
+        name
+            Name of the finding place.
+
+        lat
+            Latitude of the finding place in degrees.
+
+        long
+            Longitude of the finding place in degrees.
+
+        duplicate_radius_km
+            Maximum distance in kilometers between two entries of the same finding place.
+
+        Returns
+        -------
+        `True` if the finding place was added, `False` if it is a near-duplicate.
+        """
+        if self.find_near_duplicate(name, lat, long, duplicate_radius_km) >= 0:
+            return False
+        self._add(name, lat, long)
+        return True
+
+
+class ValidityIndex:
+    def __init__(self, df_rob: pd.DataFrame):
+        """
+        A validity-interval index over historicized data about rescued seal pups. Each version of a `Sys_id` is valid
+        from its `Erstellt_am` (creation date) until the `Erstellt_am` of the next version of the same `Sys_id`, or
+        indefinitely if it is the latest version. The intervals are computed once, so that point-in-time ("as of")
+        queries are answered with binary searches instead of grouping the whole history for each date.
+
+        Parameters
+        ----------
+        df_rob
+            A `pandas DataFrame` of historicized data about rescued seal pups.
+        """
+        df_versions = df_rob.sort_values(
+            by=["Sys_id", "Erstellt_am", "Sys_aktualisiert_am"], kind="stable"
+        )
+        df_versions = df_versions.assign(
+            valid_from=df_versions["Erstellt_am"],
+            valid_to=df_versions.groupby("Sys_id")["Erstellt_am"].shift(-1),
+        )
+        # Versions superseded at their own creation date were never valid
+        df_versions = df_versions.loc[
+            ~(df_versions["valid_to"] <= df_versions["valid_from"])
+        ]
+        self.df_versions = df_versions.sort_values(
+            by="valid_from", kind="stable"
+        ).reset_index(drop=True)
+        self.valid_from = self._to_int64(self.df_versions["valid_from"])
+        self.valid_to = self._to_int64(self.df_versions["valid_to"])
+        self.valid_to[self.df_versions["valid_to"].isna().to_numpy()] = np.iinfo(
+            "int64"
+        ).max
+
+    @staticmethod
+    def _to_int64(dates) -> np.ndarray:
+        """
+        Converts `dates` to UTC nanoseconds since the epoch. Dates without time zone are interpreted as UTC.
+        """
+        return np.asarray(
+            pd.DatetimeIndex(pd.to_datetime(dates, utc=True)).tz_convert(None),
+            dtype="datetime64[ns]",
+        ).view("int64")
+
+    def _locate(self, dates) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]:
+        """
+        Sorts the given `dates` and locates each version in them: version `i` is valid at the sorted dates with
+        positions `first[i]` up to, but excluding, `last[i]`.
+        """
+        query_dates = pd.DatetimeIndex(
+            pd.to_datetime(pd.Series(np.atleast_1d(dates)), utc=True)
+        ).sort_values()
+        query_dates_int64 = self._to_int64(query_dates)
+        first = np.searchsorted(query_dates_int64, self.valid_from, side="left")
+        last = np.maximum(
+            np.searchsorted(query_dates_int64, self.valid_to, side="left"), first
+        )
+        return query_dates, first, last
+
+    def query(self, dates) -> pd.DataFrame:
+        """
+        Returns the versions of all animals that were valid at each of the given `dates`. A version is valid at a date
+        if it was created at or before the date, and not superseded by a later version of the same `Sys_id` at or
+        before the date.
+
+        Parameters
+        ----------
+        dates
+            A date or a list-like of dates.
+
+        Returns
+        -------
+        A `pandas DataFrame` of the valid versions with an additional column `Stichtag` (: reference date), sorted by
+        `Stichtag`.
+        """
+        query_dates, first, last = self._locate(dates)
+        num_dates = last - first
+        version_positions = np.repeat(np.arange(len(num_dates)), num_dates)
+        date_positions = np.arange(num_dates.sum()) - np.repeat(
+            np.cumsum(num_dates) - num_dates - first, num_dates
+        )
+
+        return (
+            self.df_versions.drop(columns=["valid_from", "valid_to"])
+            .iloc[version_positions]
+            .assign(Stichtag=query_dates[date_positions])
+            .sort_values(by="Stichtag", kind="stable")
+            .reset_index(drop=True)
+        )
+
+    def count(self, dates, by: str) -> pd.DataFrame:
+        """
+        Counts the versions that were valid at each of the given `dates` by the values in column `by`, see `query`.
+        Instead of materializing the valid versions, each version adds one to the count of its value at the first date
+        it is valid at and subtracts one at the first date it is no longer valid at, and the counts are accumulated
+        over the sorted dates.
+
+        Parameters
+        ----------
+        dates
+            A date or a list-like of dates.
+
+        by
+            Name of the column to count by.
+
+        Returns
+        -------
+        A `pandas DataFrame` with index `Stichtag` (: reference date) and one column of counts per value in `by`.
+        """
+        query_dates, first, last = self._locate(dates)
+        codes, values = pd.factorize(self.df_versions[by])
+        is_counted = (codes >= 0) & (last > first)
+
+        counts = np.zeros((len(query_dates) + 1, len(values)), dtype="int64")
+        np.add.at(counts, (first[is_counted], codes[is_counted]), 1)
+        np.add.at(counts, (last[is_counted], codes[is_counted]), -1)
+
+        return pd.DataFrame(
+            np.cumsum(counts, axis=0)[:-1],
+            index=pd.Index(query_dates, name="Stichtag"),
+            columns=pd.Index(values, name=by),
+        ).sort_index(axis=1)
+
+
+def accept_rob_cleaned(df_rob_cleaned: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Accepts the suggested names and geo coordinates of finding places in `df_rob_cleaned` as they are, i.e., reviews
+    them without manual corrections. `RobGui` applies the same steps to the manually corrected data.
+
+    Parameters
+    ----------
+    df_rob_cleaned
+        A `pandas DataFrame` of cleaned input data with suggested finding places, see `RobHistoricizer.update_rob`.
+
+    Returns
+    -------
+    A dictionary with keys `df_new_finding_places`, i.e., the distinct finding places with columns `Name`, `Lat` and
+    `Long`, and `df_rob_manually_corrected`, i.e., the cleaned input data with the suggested finding places in
+    `Fundort`, `Lat` and `Long`.
+    """
+    # Distinct finding places
+    df_new_finding_places = (
+        df_rob_cleaned.copy()[
+            ["suggested_finding_place", "suggested_lat", "suggested_long"]
+        ]
+        .drop_duplicates()
+        .rename(
+            columns={
+                "suggested_finding_place": "Name",
+                "suggested_lat": "Lat",
+                "suggested_long": "Long",
+            }
+        )
+    )
+
+    # Reformatted `df_rob_cleaned`
+    df_rob_manually_corrected = (
+        df_rob_cleaned.copy()
+        .drop(columns=["raw_finding_place"])
+        .rename(
+            columns={
+                "suggested_finding_place": "Fundort",
+                "suggested_lat": "Lat",
+                "suggested_long": "Long",
+            }
+        )
+    )
+    return {
+        "df_new_finding_places": df_new_finding_places,
+        "df_rob_manually_corrected": df_rob_manually_corrected,
+    }
 
 
 class RobGui(PandasGui):
@@ -42,37 +516,16 @@ class RobGui(PandasGui):
         -------
         None
         """
-        df_rob_cleaned = self.get_dataframes()["df_rob_cleaned"]
-
-        # Save distinct finding places
-        df_new_finding_places = (
-            df_rob_cleaned.copy()[
-                ["suggested_finding_place", "suggested_lat", "suggested_long"]
-            ]
-            .drop_duplicates()
-            .rename(
-                columns={
-                    "suggested_finding_place": "Name",
-                    "suggested_lat": "Lat",
-                    "suggested_long": "Long",
-                }
-            )
+        reviewed_dataframes = accept_rob_cleaned(
+            self.get_dataframes()["df_rob_cleaned"]
         )
-        self.store.add_dataframe(df_new_finding_places, "df_new_finding_places")
-
-        # Reformat and save df_rob_cleaned
-        df_rob_manually_corrected = (
-            df_rob_cleaned.copy()
-            .drop(columns=["raw_finding_place"])
-            .rename(
-                columns={
-                    "suggested_finding_place": "Fundort",
-                    "suggested_lat": "Lat",
-                    "suggested_long": "Long",
-                }
-            )
+        self.store.add_dataframe(
+            reviewed_dataframes["df_new_finding_places"], "df_new_finding_places"
+        )
+        self.store.add_dataframe(
+            reviewed_dataframes["df_rob_manually_corrected"],
+            "df_rob_manually_corrected",
         )
-        self.store.add_dataframe(df_rob_manually_corrected, "df_rob_manually_corrected")
 
         # Call parent-class function
         super().closeEvent(e)
@@ -87,6 +540,9 @@ class RobHistoricizer(ABC):
         path_to_interim_data: str,
         path_to_deployment_data: str,
         path_join: str,
+        memory_limit_mb: Optional[float] = None,
+        verify_aggregates: bool = False,
+        path_to_out: str = PATH_TO_OUT,
     ):
         """
         The abstract base class to historicize information about seal pups rescued by the Seehundstation Friedrichskoog.
@@ -110,6 +566,20 @@ class RobHistoricizer(ABC):
 
         path_join
             Delimiter by which file paths should be joined,e.g., "/" or "\".
+
+        memory_limit_mb
+            Approximate memory ceiling in megabytes for processing `rob.csv`. If given, `rob.csv` is never loaded as a
+            whole, but read, deduplicated against and rewritten in chunks that fit into this ceiling. In this case,
+            `self.df_rob_historicized` and `self.df_new_rob_historicized` are not available. If `None`, `rob.csv` is
+            processed in memory.
+
+        verify_aggregates
+            If `True`, the incrementally updated aggregates are checked against aggregates recomputed from the full
+            history on each update, see `check_rob_aggregates`. This costs a full pass over `rob.csv`.
+
+        path_to_out
+            Path to a local folder to which the result files are saved for versioning, e.g., with clearml. If
+            `memory_limit_mb` is set, the merged `rob.csv` is also staged there.
         """
         # File paths
         self.path_to_raw_data = path_to_raw_data
@@ -117,6 +587,10 @@ class RobHistoricizer(ABC):
         self.path_to_interim_data = path_to_interim_data
         self.path_to_deployment_data = path_to_deployment_data
         self.path_join = path_join
+        self.path_to_rob = path_join.join([path_to_deployment_data, "rob.csv"])
+        self.path_to_out = path_to_out
+        self.memory_limit_mb = memory_limit_mb
+        self.verify_aggregates = verify_aggregates
 
         # Existing data
         self.changelogs = self._get_changelogs()
@@ -124,32 +598,57 @@ class RobHistoricizer(ABC):
         self.df_finding_places = self._read_csv(
             path_join.join([path_to_interim_data, "catalogued_finding_places.csv"])
         )
-        df_rob_historicized = self._read_csv(
-            path_join.join([path_to_deployment_data, "rob.csv"])
-        ).astype(
-            {
-                "Long": "float64",
-                "Lat": "float64",
-                "Einlieferungsdatum": "datetime64[ns]",
-            }
+        self.finding_place_index = FindingPlaceIndex(self.df_finding_places)
+        self.df_rob_historicized = (
+            self._coerce_rob_dtypes(self._read_csv(self.path_to_rob))
+            if memory_limit_mb is None
+            else None
         )
-        self.df_rob_historicized = df_rob_historicized.assign(
-            Erstellt_am=pd.to_datetime(
-                df_rob_historicized["Erstellt_am"],
-                format="%Y-%m-%d %H:%M:%S%z",
-                utc=True,
-            ),
-            Sys_aktualisiert_am=pd.to_datetime(
-                df_rob_historicized["Sys_aktualisiert_am"],
-                format="%Y-%m-%d %H:%M:%S%z",
-                utc=True,
-            ),
+        path_to_rob_current = path_join.join(
+            [path_to_deployment_data, "rob_current.csv"]
+        )
+        self.df_rob_current = (
+            self._coerce_rob_dtypes(self._read_csv(path_to_rob_current)).set_index(
+                "Sys_id"
+            )[ROB_CURRENT_COLUMNS]
+            if self._csv_exists(path_to_rob_current)
+            else None
+        )
+
+        path_to_lifecycle = path_join.join(
+            [path_to_deployment_data, "rob_lifecycle.csv"]
+        )
+        self.df_rob_lifecycle = (
+            self._coerce_lifecycle_dtypes(self._read_csv(path_to_lifecycle))
+            if self._csv_exists(path_to_lifecycle)
+            else None
+        )
+
+        path_to_aggregates = path_join.join(
+            [path_to_deployment_data, "rob_aggregates.csv"]
+        )
+        self.df_rob_aggregates = (
+            self._read_csv(path_to_aggregates)
+            if self._csv_exists(path_to_aggregates)
+            else None
         )
 
         # Interim and new data (to be filled during processing)
         self.df_rob_cleaned = None
         self.df_new_rob_historicized = None
         self.df_new_finding_places = None
+        self.df_new_rob_aggregates = None
+        self.df_new_rob_current = None
+        self.df_new_rob_lifecycle = None
+
+        # Spatial index over the coordinates of admissions (built on demand)
+        self._admission_index = None
+        self._df_admission_coords = None
+        self._df_admissions_indexed = None
+
+        # Validity-interval index over the versions of each `Sys_id` (built on demand)
+        self._validity_index = None
+        self._df_versions_indexed = None
 
     @abstractmethod
     def _get_changelogs(self) -> List[str]:
@@ -214,6 +713,153 @@ class RobHistoricizer(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def _read_csv_chunks(
+        self, path_to_csv: str, chunksize: int, usecols: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Reads the comma-separated-values (csv) file stored in `path_to_csv` in chunks, without holding the whole file
+        in memory.
+
+        Parameters
+        ----------
+        path_to_csv
+            A path to a csv-file.
+
+        chunksize
+            Number of rows per chunk.
+
+        usecols
+            Names of the columns to read. If `None`, all columns are read.
+
+        Returns
+        -------
+        An iterator over `pandas DataFrames` holding consecutive rows of the csv-file.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def _write_csv_chunks(
+        self, chunks: Iterable[pd.DataFrame], path_to_csv: str
+    ) -> None:
+        """
+        Writes the given `pandas DataFrames`, `chunks`, one after another as a single comma-separated-values (csv) file
+        into the location specified in `path_to_csv`, without holding all of them in memory. If the file does not
+        exist, yet, it is created. Otherwise, it is overwritten.
+
+        Parameters
+        ----------
+        chunks
+            An iterable of `pandas DataFrames` with identical columns.
+
+        path_to_csv
+            A path to a csv file.
+
+        Returns
+        -------
+        None
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def _csv_exists(self, path_to_csv: str) -> bool:
+        """
+        Checks whether a comma-separated-values (csv) file is stored in `path_to_csv`.
+
+        Parameters
+        ----------
+        path_to_csv
+            A path to a csv-file.
+
+        Returns
+        -------
+        `True` if the file exists, `False` otherwise.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _get_compression(path_to_csv: str) -> Optional[str]:
+        """
+        Detects whether the local file `path_to_csv` is gzip-compressed. `rob.csv` and the other csv-files are stored
+        gzip-compressed on S3, so copies of them, e.g., in `RobHistoricizerLocal`, are too.
+
+        Parameters
+        ----------
+        path_to_csv
+            A path to a local csv-file.
+
+        Returns
+        -------
+        "gzip" if the file is gzip-compressed, `None` otherwise.
+        """
+        with open(path_to_csv, "rb") as binary_file:
+            return "gzip" if binary_file.read(2) == b"\x1f\x8b" else None
+
+    @staticmethod
+    def _coerce_rob_dtypes(df_rob: pd.DataFrame) -> pd.DataFrame:
+        """
+        Coerces the columns of historicized data read from a csv-file, e.g., `rob.csv`, to their data types.
+
+        Parameters
+        ----------
+        df_rob
+            A `pandas DataFrame` of historicized data about rescued seal pups as read from a csv-file.
+
+        Returns
+        -------
+        A `pandas DataFrame` with float coordinates and datetime columns.
+        """
+        df_rob = df_rob.astype(
+            {
+                "Long": "float64",
+                "Lat": "float64",
+                "Einlieferungsdatum": "datetime64[ns]",
+            }
+        )
+        return df_rob.assign(
+            Erstellt_am=pd.to_datetime(
+                df_rob["Erstellt_am"],
+                format="%Y-%m-%d %H:%M:%S%z",
+                utc=True,
+            ),
+            Sys_aktualisiert_am=pd.to_datetime(
+                df_rob["Sys_aktualisiert_am"],
+                format="%Y-%m-%d %H:%M:%S%z",
+                utc=True,
+            ),
+        )
+
+    @staticmethod
+    def _coerce_lifecycle_dtypes(df_rob_lifecycle: pd.DataFrame) -> pd.DataFrame:
+        """
+        Coerces the columns of a lifecycle table read from a csv-file, i.e., `rob_lifecycle.csv`, to their data types.
+
+        Parameters
+        ----------
+        df_rob_lifecycle
+            A `pandas DataFrame` of lifecycles, see `compute_rob_lifecycle`, as read from a csv-file.
+
+        Returns
+        -------
+        A `pandas DataFrame` with index `Sys_id` and columns `ROB_LIFECYCLE_COLUMNS`.
+        """
+        return (
+            df_rob_lifecycle.astype(
+                {"Einlieferungsdatum": "datetime64[ns]", "Reha_Tage": "float64"}
+            )
+            .assign(
+                **{
+                    column: pd.to_datetime(
+                        df_rob_lifecycle[column],
+                        format="%Y-%m-%d %H:%M:%S%z",
+                        utc=True,
+                    )
+                    for column in ROB_TRANSITION_COLUMNS
+                }
+            )
+            .set_index("Sys_id")[ROB_LIFECYCLE_COLUMNS]
+        )
+
     @staticmethod
     def read_rob_raw(pdf_file: io.BytesIO) -> pd.DataFrame:
         """
@@ -329,117 +975,803 @@ class RobHistoricizer(ABC):
             "suggested_lat": float(lat),
         }
 
-    @staticmethod
-    def _show_rob_cleaned(df_rob_cleaned: pd.DataFrame) -> PandasGui:
+    def _get_rob_historicized(self) -> pd.DataFrame:
+        """
+        Returns `self.df_new_rob_historicized`, or `self.df_rob_historicized` if `self.update_rob` has not been run,
+        yet.
+        """
+        if self.memory_limit_mb is not None:
+            raise ValueError(
+                "The historicized data is not held in memory if `memory_limit_mb` is set."
+            )
+        if self.df_new_rob_historicized is None:
+            return self.df_rob_historicized
+        return self.df_new_rob_historicized
+
+    def _get_validity_index(self) -> ValidityIndex:
+        """
+        Returns a validity-interval index over the historicized data, see `_get_rob_historicized`. The index is rebuilt
+        only if the underlying `pandas DataFrame` has been replaced since the last call.
+
+        Returns
+        -------
+        A `ValidityIndex`.
+        """
+        df_rob = self._get_rob_historicized()
+        if self._df_versions_indexed is not df_rob:
+            self._validity_index = ValidityIndex(df_rob)
+            self._df_versions_indexed = df_rob
+        return self._validity_index
+
+    def query_as_of(self, dates) -> pd.DataFrame:
+        """
+        Returns the state of the station's population as of each of the given `dates`, i.e., for each date, the latest
+        version of every animal that had been reported up to that date.
+
+        Parameters
+        ----------
+        dates
+            A date or a list-like of dates. Dates without time zone are interpreted as UTC.
+
+        Returns
+        -------
+        A `pandas DataFrame` of historicized entries with an additional column `Stichtag` (: reference date).
+        """
+        return self._get_validity_index().query(dates)
+
+    def count_as_of(self, dates, by: str = "Aktuell") -> pd.DataFrame:
+        """
+        Counts the station's population as of each of the given `dates` by the values in column `by`, see
+        `query_as_of`.
+
+        Parameters
+        ----------
+        dates
+            A date or a list-like of dates. Dates without time zone are interpreted as UTC.
+
+        by
+            Name of the column to count by, e.g., `Aktuell` (: status) or `Tierart` (: breed).
+
+        Returns
+        -------
+        A `pandas DataFrame` with index `Stichtag` (: reference date) and one column of counts per value in `by`.
+        """
+        return self._get_validity_index().count(dates, by)
+
+    def _get_admission_index(
+        self,
+    ) -> Tuple[FindingPlaceIndex, pd.DataFrame, pd.DataFrame]:
+        """
+        Returns a spatial index over the distinct coordinates of the admissions in `self.df_new_rob_historicized`, or in
+        `self.df_rob_historicized` if `self.update_rob` has not been run, yet. The index is rebuilt only if the
+        underlying `pandas DataFrame` has been replaced since the last call.
+
+        Returns
+        -------
+        A tuple of the `FindingPlaceIndex`, a `pandas DataFrame` of the indexed coordinates in insertion order, and the
+        indexed `pandas DataFrame` of admissions.
+        """
+        df_rob = self._get_rob_historicized()
+        if self._df_admissions_indexed is not df_rob:
+            self._df_admission_coords = (
+                df_rob[["Lat", "Long"]]
+                .dropna()
+                .drop_duplicates()
+                .reset_index(drop=True)
+            )
+            self._admission_index = FindingPlaceIndex(self._df_admission_coords)
+            self._df_admissions_indexed = df_rob
+        return (
+            self._admission_index,
+            self._df_admission_coords,
+            self._df_admissions_indexed,
+        )
+
+    def _get_admissions_at(
+        self, positions: np.ndarray, distances: np.ndarray
+    ) -> pd.DataFrame:
+        """
+        Returns all admissions at the coordinates with the given `positions` in the admission index, together with the
+        column `Distanz_km` holding the given `distances`.
+        """
+        _, df_admission_coords, df_rob = self._get_admission_index()
+        df_found_coords = df_admission_coords.iloc[positions].assign(
+            Distanz_km=distances
+        )
+        return df_rob.merge(df_found_coords, on=["Lat", "Long"]).sort_values(
+            by=["Distanz_km", "Einlieferungsdatum"]
+        )
+
+    def get_admissions_within(
+        self, lat: float, long: float, radius_km: float
+    ) -> pd.DataFrame:
+        """
+        Returns all historicized admissions of seal pups found within `radius_km` kilometers of (`lat`, `long`).
+
+        Parameters
+        ----------
+        lat
+            Latitude of the query location in degrees.
+
+        long
+            Longitude of the query location in degrees.
+
+        radius_km
+            Search radius in kilometers.
+
+        Returns
+        -------
+        A `pandas DataFrame` of historicized admissions with an additional column `Distanz_km` (: distance in
+        kilometers), sorted by distance.
+        """
+        admission_index, _, _ = self._get_admission_index()
+        return self._get_admissions_at(
+            *admission_index.query_radius(lat, long, radius_km)
+        )
+
+    def get_admissions_nearest(
+        self, lat: float, long: float, k: int = 1
+    ) -> pd.DataFrame:
+        """
+        Returns all historicized admissions of seal pups found at the `k` finding places closest to (`lat`, `long`).
+
+        Parameters
+        ----------
+        lat
+            Latitude of the query location in degrees.
+
+        long
+            Longitude of the query location in degrees.
+
+        k
+            Number of finding places.
+
+        Returns
+        -------
+        A `pandas DataFrame` of historicized admissions with an additional column `Distanz_km` (: distance in
+        kilometers), sorted by distance.
+        """
+        admission_index, _, _ = self._get_admission_index()
+        return self._get_admissions_at(*admission_index.query_nearest(lat, long, k))
+
+    @staticmethod
+    def _show_rob_cleaned(df_rob_cleaned: pd.DataFrame) -> PandasGui:
+        """
+        Shows `df_rob_cleaned` in a `PandasGui` and allows for manual correction. The corrected data frame is saved as
+        an attribute of the `PandasGui` instance.
+
+        Returns
+        -------
+        An instance of class `PandasGui`.
+        """
+        # TODO refactor so that only unique location mappings are shown
+        rob_gui = RobGui(
+            df_rob_cleaned=df_rob_cleaned.sort_values(
+                by=["Erstellt_am", "Einlieferungsdatum"], ascending=False
+            )
+        )
+        rob_gui.caller_stack = inspect.currentframe().f_back
+
+        # Register IPython magic
+        try:
+
+            @register_line_magic
+            def pg(line):
+                rob_gui.store.eval_magic(line)
+                return line
+
+        except Exception as e:
+            # Let this silently fail if no IPython console exists
+            if (
+                e.args[0]
+                == "Decorator can only run in context where `get_ipython` exists"
+            ):
+                pass
+            else:
+                raise e
+
+        return rob_gui
+
+    def _review_rob_cleaned(
+        self, df_rob_cleaned: pd.DataFrame
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Lets the suggested names and geo coordinates of finding places in `df_rob_cleaned` be reviewed and corrected
+        manually in a `PandasGui`, see `_show_rob_cleaned`.
+
+        Parameters
+        ----------
+        df_rob_cleaned
+            A `pandas DataFrame` of cleaned input data with suggested finding places.
+
+        Returns
+        -------
+        A dictionary with keys `df_rob_manually_corrected` and `df_new_finding_places`, see `accept_rob_cleaned`.
+        """
+        return self._show_rob_cleaned(df_rob_cleaned).get_dataframes()
+
+    @staticmethod
+    def _compute_hash(df_columns2hash: pd.DataFrame) -> pd.Series:
+        """
+        Computes the `sha256`- value for each row in `df_columns2hash`.
+
+        Parameters
+        ----------
+        df_columns2hash
+            A `pandas DataFrame`.
+
+        Returns
+        -------
+        A `pandas Series` of hashed column values in `df_columns2hash`.
+        """
+        return df_columns2hash.apply(
+            lambda row: sha256(row.to_string(index=False).encode("utf-8")).hexdigest(),
+            axis=1,
+        )
+
+    def _get_chunksize(self) -> int:
+        """
+        Estimates how many rows of `rob.csv` fit into a chunk, given `self.memory_limit_mb`. The memory per row is
+        measured on the first `CHUNK_SAMPLE_ROWS` rows, and multiplied by `CHUNK_MEMORY_OVERHEAD` to account for the
+        copies made while processing a chunk.
+
+        Returns
+        -------
+        The number of rows per chunk.
+        """
+        df_sample = next(
+            iter(self._read_csv_chunks(self.path_to_rob, CHUNK_SAMPLE_ROWS)),
+            pd.DataFrame(),
+        )
+        if len(df_sample) == 0:
+            return CHUNK_SAMPLE_ROWS
+        bytes_per_row = (
+            CHUNK_MEMORY_OVERHEAD
+            * self._coerce_rob_dtypes(df_sample).memory_usage(deep=True).sum()
+            / len(df_sample)
+        )
+        return max(int(self.memory_limit_mb * 1024**2 / bytes_per_row), 1)
+
+    def _iter_rob_historicized(self) -> Iterator[pd.DataFrame]:
+        """
+        Iterates over `rob.csv` in chunks that fit into `self.memory_limit_mb`, see `_get_chunksize`.
+
+        Returns
+        -------
+        An iterator over `pandas DataFrames` of historicized data about rescued seal pups.
+        """
+        for df_chunk in self._read_csv_chunks(self.path_to_rob, self._get_chunksize()):
+            yield self._coerce_rob_dtypes(df_chunk)
+
+    def _find_existing_hashes(self, sys_hashes: pd.Series) -> pd.Series:
+        """
+        Checks which of the given `sys_hashes` already exist in the historicized data. If `self.memory_limit_mb` is set,
+        only column `Sys_hash` of `rob.csv` is streamed in chunks, and only matching hashes are kept in memory.
+
+        Parameters
+        ----------
+        sys_hashes
+            A `pandas Series` of values in `Sys_hash`.
+
+        Returns
+        -------
+        A boolean `pandas Series` that is `True` for hashes that already exist.
+        """
+        if self.memory_limit_mb is None:
+            return sys_hashes.isin(self.df_rob_historicized["Sys_hash"])
+
+        existing_hashes = set()
+        for df_chunk in self._read_csv_chunks(
+            self.path_to_rob, self._get_chunksize(), usecols=["Sys_hash"]
+        ):
+            existing_hashes.update(
+                df_chunk.loc[df_chunk["Sys_hash"].isin(sys_hashes), "Sys_hash"]
+            )
+        return sys_hashes.isin(existing_hashes)
+
+    @staticmethod
+    def _merge_sorted_chunks(
+        chunks: Iterable[pd.DataFrame], df_rob_delta: pd.DataFrame
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Merges `df_rob_delta` into chunks of historicized data that are sorted by `ROB_SORT_KEYS`. Each output chunk
+        holds the rows of an input chunk whose `Einlieferungsdatum` (: admission date) is less than the latest one seen
+        so far, and the entries of `df_rob_delta` up to this date. The remaining rows are carried over to the next
+        chunk, so that the output is sorted by `ROB_SORT_KEYS` as a whole.
+
+        Parameters
+        ----------
+        chunks
+            An iterable of `pandas DataFrames` of historicized data sorted by `ROB_SORT_KEYS`.
+
+        df_rob_delta
+            A `pandas DataFrame` of novel historicized entries, see `historicize_rob`.
+
+        Returns
+        -------
+        An iterator over `pandas DataFrames` with columns `ROB_COLUMNS`.
+        """
+        df_rob_delta = df_rob_delta[ROB_COLUMNS]
+        df_carry = df_rob_delta.iloc[:0]
+        for df_chunk in chunks:
+            df_chunk = pd.concat([df_carry, df_chunk[ROB_COLUMNS]], ignore_index=True)
+            max_date = df_chunk["Einlieferungsdatum"].max()
+            is_done = df_chunk["Einlieferungsdatum"] < max_date
+            is_delta_done = df_rob_delta["Einlieferungsdatum"] < max_date
+            yield pd.concat(
+                [df_chunk.loc[is_done], df_rob_delta.loc[is_delta_done]]
+            ).sort_values(by=ROB_SORT_KEYS)
+            df_carry = df_chunk.loc[~is_done]
+            df_rob_delta = df_rob_delta.loc[~is_delta_done]
+        yield pd.concat([df_carry, df_rob_delta]).sort_values(by=ROB_SORT_KEYS)
+
+    def _compute_rob_current_and_lifecycle(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Computes the current state and lifecycle of each animal in the historicized data from scratch. If
+        `self.memory_limit_mb` is set, the chunks of `rob.csv` are folded into them one after another.
+
+        Returns
+        -------
+        A tuple of `pandas DataFrames` of current states, see `compute_rob_current`, and lifecycles, see
+        `compute_rob_lifecycle`.
+        """
+        if self.memory_limit_mb is None:
+            return (
+                self.compute_rob_current(self.df_rob_historicized),
+                self.compute_rob_lifecycle(self.df_rob_historicized),
+            )
+
+        df_rob_current, df_rob_lifecycle = None, None
+        for df_chunk in self._iter_rob_historicized():
+            if df_rob_current is None:
+                df_rob_current = self.compute_rob_current(df_chunk)
+                df_rob_lifecycle = self.compute_rob_lifecycle(df_chunk)
+            else:
+                df_rob_current = self.update_rob_current(df_rob_current, df_chunk)
+                df_rob_lifecycle = self.update_rob_lifecycle(df_rob_lifecycle, df_chunk)
+        return df_rob_current, df_rob_lifecycle
+
+    def _write_rob_historicized_in_chunks(self, df_rob_delta: pd.DataFrame) -> None:
+        """
+        Merges `df_rob_delta` into `rob.csv` chunk by chunk, see `_merge_sorted_chunks`. The merged chunks are first
+        written to the local copy in `self.path_to_out`, which is then streamed to `self.path_to_rob`, so that
+        `rob.csv` is never read and overwritten at the same time.
+
+        Parameters
+        ----------
+        df_rob_delta
+            A `pandas DataFrame` of novel historicized entries, see `historicize_rob`.
+
+        Returns
+        -------
+        None
+        """
+        chunksize = self._get_chunksize()
+        path_to_local_rob = os.path.join(self.path_to_out, "rob.csv")
+        for i, df_chunk in enumerate(
+            self._merge_sorted_chunks(self._iter_rob_historicized(), df_rob_delta)
+        ):
+            df_chunk.to_csv(
+                path_to_local_rob,
+                mode="w" if i == 0 else "a",
+                header=i == 0,
+                index=False,
+            )
+        self._write_csv_chunks(
+            pd.read_csv(path_to_local_rob, chunksize=chunksize), self.path_to_rob
+        )
+
+    def _compute_distinct_hash(self, df_columns2hash: pd.DataFrame) -> pd.Series:
+        """
+        Computes the `sha256`-value for each row in `df_columns2hash`, see `_compute_hash`, but hashes each distinct row
+        only once. This pays off since each raw pdf file lists all animals again.
+
+        Parameters
+        ----------
+        df_columns2hash
+            A `pandas DataFrame`.
+
+        Returns
+        -------
+        A `pandas Series` of hashed column values in `df_columns2hash`.
+        """
+        is_distinct = ~df_columns2hash.duplicated()
+        distinct_hashes = self._compute_hash(df_columns2hash.loc[is_distinct])
+        group_numbers = df_columns2hash.groupby(
+            list(df_columns2hash.columns), sort=False, dropna=False
+        ).ngroup()
+        return pd.Series(
+            distinct_hashes.to_numpy()[group_numbers.to_numpy()],
+            index=df_columns2hash.index,
+        )
+
+    def historicize_rob(self) -> pd.DataFrame:
+        """
+        Compares entries in `pandas Dataframes` `self.df_rob_cleaned` and `self.df_rob_historicized` and only returns
+        values  of `self.df_rob_cleaned` that do not already exist in `self.df_rob_historicized`.
+
+        Returns
+        -------
+        A `pandas Dataframe` that holds novel, cleaned input data about rescued seal pups. It is empty if nothing has
+        changed.
+        """
+        df_rob_cleaned = self.df_rob_cleaned
+
+        # Create system-id and system-hash values for `df_rob_cleaned`:
+        # Entries are identified by their values in `Fundort` (finding place), `Einlieferungsdatum` (admission date),
+        # and `Tierart` (breed). Since there may exist multiple animals of the same finding place, admission date and
+        # breed, the count of an animal within each group by `Erstellt_am` (creation date) is additionally used for
+        # idenfification.
+        sys_id = self._compute_distinct_hash(
+            pd.DataFrame(
+                {
+                    "Count": df_rob_cleaned.groupby(
+                        ["Fundort", "Einlieferungsdatum", "Tierart", "Erstellt_am"]
+                    ).cumcount(),
+                    "Fundort": df_rob_cleaned["Fundort"],
+                    "Einlieferungsdatum": df_rob_cleaned["Einlieferungsdatum"],
+                    "Tierart": df_rob_cleaned["Tierart"],
+                }
+            )
+        )
+        sys_hash = self._compute_distinct_hash(
+            pd.DataFrame({"Sys_id": sys_id, "Aktuell": df_rob_cleaned["Aktuell"]})
+        )
+
+        # For each `Sys_hash`, keep only the position of the entry with the earliest date in `Erstellt_am`, in a single
+        # sort and deduplication pass over the keys
+        df_keys = pd.DataFrame(
+            {"Sys_hash": sys_hash, "Erstellt_am": df_rob_cleaned["Erstellt_am"]}
+        ).reset_index(drop=True)
+        df_keys = df_keys.sort_values(by=["Sys_hash", "Erstellt_am"], kind="stable")
+        df_keys = df_keys.loc[~df_keys["Sys_hash"].duplicated()]
+
+        # Drop entries that already exist in the historicized data
+        df_keys = df_keys.loc[~self._find_existing_hashes(df_keys["Sys_hash"])]
+
+        # Return entries that do not exist in the historicized data
+        positions = df_keys.index.to_numpy()
+        df_rob_new = df_rob_cleaned.take(positions)
+        df_rob_new["Sys_id"] = sys_id.to_numpy()[positions]
+        df_rob_new["Sys_hash"] = df_keys["Sys_hash"].to_numpy()
+        df_rob_new["Sys_aktualisiert_am"] = datetime.now(timezone.utc)
+        return df_rob_new
+
+    @staticmethod
+    def _get_latest_versions(df_rob: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the latest version, i.e., the entry with the latest date in `Erstellt_am`, of each `Sys_id` in
+        `df_rob`.
+
+        Parameters
+        ----------
+        df_rob
+            A `pandas DataFrame` of historicized data about rescued seal pups.
+
+        Returns
+        -------
+        A `pandas DataFrame` with one entry per `Sys_id`.
+        """
+        return df_rob.sort_values(
+            by=["Erstellt_am", "Sys_aktualisiert_am"], kind="stable"
+        ).drop_duplicates(subset="Sys_id", keep="last")
+
+    @staticmethod
+    def _count_rob(df_rob_latest: pd.DataFrame) -> pd.DataFrame:
+        """
+        Counts the animals in `df_rob_latest` by `AGGREGATE_KEYS`.
+
+        Parameters
+        ----------
+        df_rob_latest
+            A `pandas DataFrame` with one entry per `Sys_id`, see `_get_latest_versions`.
+
+        Returns
+        -------
+        A `pandas DataFrame` with columns `AGGREGATE_KEYS` and `Anzahl` (: count).
+        """
+        return (
+            df_rob_latest.assign(
+                Monat=pd.to_datetime(df_rob_latest["Einlieferungsdatum"]).dt.strftime(
+                    "%Y-%m"
+                )
+            )
+            .groupby(AGGREGATE_KEYS, dropna=False)
+            .size()
+            .rename("Anzahl")
+            .reset_index()
+        )
+
+    @staticmethod
+    def _sort_rob_aggregates(df_rob_aggregates: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drops empty groups from `df_rob_aggregates` and sorts it by `AGGREGATE_KEYS`.
+        """
+        return (
+            df_rob_aggregates.loc[df_rob_aggregates["Anzahl"] != 0]
+            .astype({"Anzahl": "int64"})
+            .sort_values(by=AGGREGATE_KEYS)
+            .reset_index(drop=True)
+        )
+
+    def compute_rob_aggregates(self, df_rob: pd.DataFrame) -> pd.DataFrame:
+        """
+        Computes the number of animals in `df_rob` per admission month (`Monat`), breed (`Tierart`), current status
+        (`Aktuell`) and finding place (`Fundort`, `Lat`, `Long`) from scratch. Each animal is counted once, with its
+        latest status. Coarser aggregates, e.g., the number of animals per month, are sums over this table.
+
+        Parameters
+        ----------
+        df_rob
+            A `pandas DataFrame` of historicized data about rescued seal pups.
+
+        Returns
+        -------
+        A `pandas DataFrame` with columns `AGGREGATE_KEYS` and `Anzahl` (: count).
+        """
+        return self._sort_rob_aggregates(
+            self._count_rob(self._get_latest_versions(df_rob))
+        )
+
+    def update_rob_aggregates(
+        self,
+        df_rob_aggregates: pd.DataFrame,
+        df_rob_current_old: pd.DataFrame,
+        df_rob_current_new: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """
+        Incrementally updates `df_rob_aggregates` with the animals whose current state has changed. Each of these
+        animals is added with its new current state and, if it already existed, subtracted with its previous one.
+
+        Parameters
+        ----------
+        df_rob_aggregates
+            A `pandas DataFrame` of aggregates, see `compute_rob_aggregates`.
+
+        df_rob_current_old
+            The previous current state of the changed animals that already existed, see `compute_rob_current`.
+
+        df_rob_current_new
+            The new current state of all changed animals, see `update_rob_current`.
+
+        Returns
+        -------
+        A `pandas DataFrame` with columns `AGGREGATE_KEYS` and `Anzahl` (: count).
+        """
+        df_count_old = self._count_rob(df_rob_current_old)
+        return self._sort_rob_aggregates(
+            pd.concat(
+                [
+                    df_rob_aggregates,
+                    self._count_rob(df_rob_current_new),
+                    df_count_old.assign(Anzahl=-df_count_old["Anzahl"]),
+                ],
+                ignore_index=True,
+            )
+            .groupby(AGGREGATE_KEYS, dropna=False)["Anzahl"]
+            .sum()
+            .reset_index()
+        )
+
+    def compute_rob_current(self, df_rob: pd.DataFrame) -> pd.DataFrame:
         """
-        Shows `df_rob_cleaned` in a `PandasGui` and allows for manual correction. The corrected data frame is saved as
-        an attribute of the `PandasGui` instance.
+        Computes the current state, i.e., the latest version, of each animal in `df_rob` from scratch.
+
+        Parameters
+        ----------
+        df_rob
+            A `pandas DataFrame` of historicized data about rescued seal pups.
 
         Returns
         -------
-        An instance of class `PandasGui`.
+        A `pandas DataFrame` with index `Sys_id` and columns `ROB_CURRENT_COLUMNS`.
         """
-        # TODO refactor so that only unique location mappings are shown
-        rob_gui = RobGui(
-            df_rob_cleaned=df_rob_cleaned.sort_values(
-                by=["Erstellt_am", "Einlieferungsdatum"], ascending=False
-            )
+        return (
+            self._get_latest_versions(df_rob)
+            .set_index("Sys_id")[ROB_CURRENT_COLUMNS]
+            .sort_index()
         )
-        rob_gui.caller_stack = inspect.currentframe().f_back
 
-        # Register IPython magic
-        try:
+    def update_rob_current(
+        self, df_rob_current: pd.DataFrame, df_rob_delta: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Updates the current state in a copy of `df_rob_current` with the novel entries in `df_rob_delta`: the entries of
+        existing animals are overwritten if `df_rob_delta` holds a later version, and new animals are appended.
+        `df_rob_current` itself is left unchanged.
 
-            @register_line_magic
-            def pg(line):
-                rob_gui.store.eval_magic(line)
-                return line
+        Parameters
+        ----------
+        df_rob_current
+            A `pandas DataFrame` of current states, see `compute_rob_current`.
 
-        except Exception as e:
-            # Let this silently fail if no IPython console exists
-            if (
-                e.args[0]
-                == "Decorator can only run in context where `get_ipython` exists"
-            ):
-                pass
-            else:
-                raise e
+        df_rob_delta
+            A `pandas DataFrame` of novel historicized entries, see `historicize_rob`.
 
-        return rob_gui
+        Returns
+        -------
+        A `pandas DataFrame` with index `Sys_id` and columns `ROB_CURRENT_COLUMNS`.
+        """
+        is_existing = df_rob_current.index.isin(df_rob_delta["Sys_id"])
+        df_rob_updates = self.compute_rob_current(
+            pd.concat(
+                [
+                    df_rob_current.loc[is_existing].reset_index(),
+                    df_rob_delta[["Sys_id"] + ROB_CURRENT_COLUMNS],
+                ],
+                ignore_index=True,
+            )
+        )
+        is_new = ~df_rob_updates.index.isin(df_rob_current.index)
+        df_rob_current = df_rob_current.copy()
+        df_rob_current.loc[
+            df_rob_updates.index[~is_new], ROB_CURRENT_COLUMNS
+        ] = df_rob_updates.loc[~is_new]
+        if is_new.any():
+            df_rob_current = pd.concat(
+                [df_rob_current, df_rob_updates.loc[is_new]]
+            ).sort_index()
+        return df_rob_current
 
     @staticmethod
-    def _compute_hash(df_columns2hash: pd.DataFrame) -> pd.Series:
+    def _add_rehabilitation_duration(df_rob_lifecycle: pd.DataFrame) -> pd.DataFrame:
         """
-        Computes the `sha256`- value for each row in `df_columns2hash`.
+        Adds the column `Reha_Tage` (: days in rehabilitation) to `df_rob_lifecycle`, i.e., the number of days from
+        `Einlieferungsdatum` (: admission date) to the first report of the animal as released or deceased. It is
+        missing for animals still in rehabilitation.
+        """
+        released, deceased = (
+            df_rob_lifecycle["Ausgewildert_am"],
+            df_rob_lifecycle["Verstorben_am"],
+        )
+        end_of_rehabilitation = released.mask(deceased < released, deceased).fillna(
+            deceased
+        )
+        admission_date = pd.to_datetime(
+            df_rob_lifecycle["Einlieferungsdatum"]
+        ).dt.tz_localize("UTC")
+        return df_rob_lifecycle.assign(
+            Reha_Tage=(end_of_rehabilitation - admission_date).dt.total_seconds()
+            / (24 * 60 * 60)
+        )[ROB_LIFECYCLE_COLUMNS]
+
+    def compute_rob_lifecycle(self, df_rob: pd.DataFrame) -> pd.DataFrame:
+        """
+        Computes the lifecycle of each animal in `df_rob` from scratch. That is, its finding place, breed and admission
+        date, the date of the first report of each status in `ROB_STATUSES` (: `<status>_am`), and the days spent in
+        rehabilitation.
 
         Parameters
         ----------
-        df_columns2hash
-            A `pandas DataFrame`.
+        df_rob
+            A `pandas DataFrame` of historicized data about rescued seal pups.
 
         Returns
         -------
-        A `pandas Series` of hashed column values in `df_columns2hash`.
+        A `pandas DataFrame` with index `Sys_id` and columns `ROB_LIFECYCLE_COLUMNS`.
         """
-        return df_columns2hash.apply(
-            lambda row: sha256(row.to_string(index=False).encode("utf-8")).hexdigest(),
-            axis=1,
+        df_transitions = (
+            df_rob.loc[df_rob["Aktuell"].isin(ROB_STATUSES)]
+            .groupby(["Sys_id", "Aktuell"])["Erstellt_am"]
+            .min()
+            .unstack()
+            .reindex(columns=ROB_STATUSES)
+            .add_suffix("_am")
         )
+        df_transitions = df_transitions.assign(
+            **{
+                column: pd.to_datetime(df_transitions[column], utc=True)
+                for column in ROB_TRANSITION_COLUMNS
+            }
+        )
+        df_admissions = self._get_latest_versions(df_rob).set_index("Sys_id")[
+            ["Fundort", "Tierart", "Einlieferungsdatum"]
+        ]
+        return self._add_rehabilitation_duration(
+            df_admissions.join(df_transitions)
+        ).sort_index()
 
-    def historicize_rob(self) -> pd.DataFrame:
+    def update_rob_lifecycle(
+        self, df_rob_lifecycle: pd.DataFrame, df_rob_delta: pd.DataFrame
+    ) -> pd.DataFrame:
         """
-        Compares entries in `pandas Dataframes` `self.df_rob_cleaned` and `self.df_rob_historicized` and only returns
-        values  of `self.df_rob_cleaned` that do not already exist in `self.df_rob_historicized`.
+        Incrementally updates `df_rob_lifecycle` with the novel entries in `df_rob_delta`. Only the animals in
+        `df_rob_delta` are touched: their status-transition dates are the earlier of the existing ones and those in
+        `df_rob_delta`, and new animals are appended.
+
+        Parameters
+        ----------
+        df_rob_lifecycle
+            A `pandas DataFrame` of lifecycles, see `compute_rob_lifecycle`.
+
+        df_rob_delta
+            A `pandas DataFrame` of novel historicized entries, see `historicize_rob`.
 
         Returns
         -------
-        A `pandas Dataframe` that holds novel, cleaned input data about rescued seal pups.
+        A `pandas DataFrame` with index `Sys_id` and columns `ROB_LIFECYCLE_COLUMNS`.
         """
-        df_rob_new = self.df_rob_cleaned.copy()
-        df_rob_old = self.df_rob_historicized.copy()
-
-        # Create system-id and system-hash value in `df_rob_new`:
-        # Entries are identified by their values in `Fundort` (finding place), `Einlieferungsdatum` (admission date),
-        # and `Tierart` (breed). Since there may exist multiple animals of the same finding place, admission date and
-        # breed, the count of an animal within each group by `Erstellt_am` (creation date) is additionally used for
-        # idenfification.
-        df_rob_new["Sys_id"] = self._compute_hash(
-            df_rob_new.assign(
-                Count=(
-                    df_rob_new.groupby(
-                        [
-                            "Fundort",
-                            "Einlieferungsdatum",
-                            "Tierart",
-                            "Erstellt_am",
-                        ]  # Group
-                    ).cumcount()
-                )
-            )[
-                ["Count", "Fundort", "Einlieferungsdatum", "Tierart"]
-            ]  # Unique identifier
+        df_delta_lifecycle = self.compute_rob_lifecycle(df_rob_delta)
+        is_changed = df_rob_lifecycle.index.isin(df_delta_lifecycle.index)
+        df_rob_updates = (
+            pd.concat([df_rob_lifecycle.loc[is_changed], df_delta_lifecycle])
+            .groupby(level=0)
+            .agg(
+                {
+                    "Fundort": "first",
+                    "Tierart": "first",
+                    "Einlieferungsdatum": "first",
+                    **{column: "min" for column in ROB_TRANSITION_COLUMNS},
+                }
+            )
         )
-        df_rob_new["Sys_hash"] = self._compute_hash(df_rob_new[["Sys_id", "Aktuell"]])
+        return pd.concat(
+            [
+                df_rob_lifecycle.loc[~is_changed],
+                self._add_rehabilitation_duration(df_rob_updates),
+            ]
+        ).sort_index()
 
-        # For each `Sys_hash`, keep only the entry with the earliest date in `Erstellt_am` in `df_rob_new`
-        df_rob_new = (
-            df_rob_new.sort_values(["Sys_hash", "Erstellt_am"])
-            .groupby("Sys_hash")
-            .first()
-            .reset_index()
-        )
+    def _recompute_rob_aggregates(self, df_rob_delta: pd.DataFrame) -> pd.DataFrame:
+        """
+        Recomputes the aggregates of the historicized data, including the novel entries in `df_rob_delta`, from the
+        full history, see `compute_rob_aggregates`. If `self.memory_limit_mb` is set, the latest version of each animal
+        is folded over the chunks of `rob.csv` and `df_rob_delta` before the animals are counted.
 
-        # Find entries that already exist in `df_rob_old` and that can be ignored in `df_rob_new`
-        entry_exists = df_rob_new["Sys_hash"].isin(df_rob_old["Sys_hash"])
-        if entry_exists.all():  # Abort historcization procedure if nothing has changed
-            print(
-                "No changes in `self.rob_raw with respect` to `self.df_rob_historicized`. Terminating update."
+        Parameters
+        ----------
+        df_rob_delta
+            A `pandas DataFrame` of novel historicized entries, see `historicize_rob`.
+
+        Returns
+        -------
+        A `pandas DataFrame` with columns `AGGREGATE_KEYS` and `Anzahl` (: count).
+        """
+        if self.memory_limit_mb is None:
+            return self.compute_rob_aggregates(self.df_new_rob_historicized)
+
+        df_rob_latest = None
+        for df_chunk in chain(self._iter_rob_historicized(), [df_rob_delta]):
+            df_chunk_latest = self._get_latest_versions(df_chunk[ROB_COLUMNS])
+            df_rob_latest = (
+                df_chunk_latest
+                if df_rob_latest is None
+                else self._get_latest_versions(
+                    pd.concat([df_rob_latest, df_chunk_latest], ignore_index=True)
+                )
             )
-            sys.exit(0)
+        return self._sort_rob_aggregates(self._count_rob(df_rob_latest))
+
+    def check_rob_aggregates(
+        self, df_rob_aggregates: pd.DataFrame, df_rob_delta: pd.DataFrame
+    ) -> bool:
+        """
+        Checks whether `df_rob_aggregates` matches the aggregates recomputed from the full history, including the novel
+        entries in `df_rob_delta`, see `_recompute_rob_aggregates`.
+
+        Parameters
+        ----------
+        df_rob_aggregates
+            A `pandas DataFrame` of aggregates, see `compute_rob_aggregates`.
+
+        df_rob_delta
+            A `pandas DataFrame` of novel historicized entries, see `historicize_rob`.
 
-        # Return entries that do not exist in `df_rob_old`
-        return df_rob_new[~entry_exists].assign(
-            Sys_aktualisiert_am=datetime.now(timezone.utc)
+        Returns
+        -------
+        `True` if the aggregates are consistent, `False` otherwise.
+        """
+        df_comparison = self._recompute_rob_aggregates(df_rob_delta).merge(
+            df_rob_aggregates,
+            on=AGGREGATE_KEYS,
+            how="outer",
+            suffixes=("_expected", "_actual"),
+        )
+        return (
+            df_comparison["Anzahl_expected"]
+            .fillna(0)
+            .eq(df_comparison["Anzahl_actual"].fillna(0))
+            .all()
         )
 
     def update_rob(self) -> None:
@@ -448,7 +1780,10 @@ class RobHistoricizer(ABC):
         1. Reads the raw PDF into a `pandas Dataframe`
         2. Corrects spelling mistakes in the names of finding places in the raw data and adds geo-coordinates
         3. Updates the catalogued finding places
-        4. Saves the cleaned input data and catalogued finding places to the local file system
+        4. Updates the current state and lifecycle of each animal and the aggregates of the historicized data for the
+           dashboard
+        5. Saves the cleaned input data, catalogued finding places, current states, lifecycles and aggregates to the
+           local file system
 
         Returns
         -------
@@ -457,7 +1792,7 @@ class RobHistoricizer(ABC):
         # Check for changes
         if len(self.changelogs) == 0:
             print("No changes new files exist. Terminating update.")
-            sys.exit(0)
+            return
 
         # Read raw data from ByteIO object into pandas DataFrame
         df_rob_raw = pd.concat(
@@ -481,37 +1816,92 @@ class RobHistoricizer(ABC):
 
         self.df_rob_cleaned, df_new_finding_places = itemgetter(
             "df_rob_manually_corrected", "df_new_finding_places"
-        )(self._show_rob_cleaned(df_rob_cleaned).get_dataframes())
+        )(self._review_rob_cleaned(df_rob_cleaned))
 
         # Historicize the information in `self.df_rob_cleaned`
         df_new_rob_historicized = self.historicize_rob()
-
-        # Save `df_new_finding_places` and `df_new_rob_historicized`
+        if len(df_new_rob_historicized) == 0:
+            print(
+                "No changes in `self.rob_raw with respect` to `self.df_rob_historicized`. Terminating update."
+            )
+            return
+
+        # Save `df_new_finding_places` and `df_new_rob_historicized`. New finding places that have the same name as a
+        # catalogued finding place and lie within `FINDING_PLACE_DUPLICATE_RADIUS_KM` of it are near-duplicates and are
+        # not added to the catalogue. Catalogued finding places are returned unchanged and are not counted as such.
+        is_new_finding_place = [
+            self.finding_place_index.insert(name, lat, long)
+            for name, lat, long in df_new_finding_places[
+                ["Name", "Lat", "Long"]
+            ].itertuples(index=False)
+        ]
+        is_catalogued = pd.MultiIndex.from_frame(
+            df_new_finding_places[["Name", "Lat", "Long"]]
+        ).isin(
+            pd.MultiIndex.from_frame(self.df_finding_places[["Name", "Lat", "Long"]])
+        )
+        num_near_duplicates = int(
+            (~np.array(is_new_finding_place, dtype=bool) & ~is_catalogued).sum()
+        )
+        print(f"Skipped {num_near_duplicates} near-duplicate finding places.")
         self.df_new_finding_places = (
             pd.concat(
-                [self.df_finding_places, df_new_finding_places], ignore_index=True
+                [
+                    self.df_finding_places,
+                    df_new_finding_places[is_new_finding_place],
+                ],
+                ignore_index=True,
             )
             .drop_duplicates()
             .sort_values(by="Name")[["Name", "Lat", "Long"]]
         )
-        self.df_new_rob_historicized = pd.concat(
-            [self.df_rob_historicized, df_new_rob_historicized], ignore_index=True
-        ).sort_values(by=["Einlieferungsdatum", "Tierart", "Fundort"])[
-            [
-                "Sys_id",
-                "Fundort",
-                "Lat",
-                "Long",
-                "Einlieferungsdatum",
-                "Tierart",
-                "Aktuell",
-                "Erstellt_am",
-                "Sys_aktualisiert_am",
-                "Sys_hash",
-            ]
+        if self.memory_limit_mb is None:
+            self.df_new_rob_historicized = pd.concat(
+                [self.df_rob_historicized, df_new_rob_historicized], ignore_index=True
+            ).sort_values(by=ROB_SORT_KEYS)[ROB_COLUMNS]
+
+        # Compute the current state and lifecycle of each animal from scratch if they do not exist, yet
+        if self.df_rob_current is None or self.df_rob_lifecycle is None:
+            (
+                self.df_rob_current,
+                self.df_rob_lifecycle,
+            ) = self._compute_rob_current_and_lifecycle()
+
+        # Update the current state and lifecycle of the animals in `df_new_rob_historicized` only
+        changed_sys_ids = df_new_rob_historicized["Sys_id"].unique()
+        df_rob_current_old = self.df_rob_current.loc[
+            self.df_rob_current.index.isin(changed_sys_ids)
         ]
+        self.df_new_rob_current = self.update_rob_current(
+            self.df_rob_current, df_new_rob_historicized
+        )
+        self.df_new_rob_lifecycle = self.update_rob_lifecycle(
+            self.df_rob_lifecycle, df_new_rob_historicized
+        )
+
+        # Update the aggregates with the changed current states only, or compute them from scratch if none exist, yet.
+        # When processing in chunks, the aggregates are computed from the current states instead of the full history.
+        if self.df_rob_aggregates is None:
+            self.df_new_rob_aggregates = self.compute_rob_aggregates(
+                self.df_new_rob_historicized
+                if self.memory_limit_mb is None
+                else self.df_new_rob_current.reset_index()
+            )
+        else:
+            self.df_new_rob_aggregates = self.update_rob_aggregates(
+                self.df_rob_aggregates,
+                df_rob_current_old,
+                self.df_new_rob_current.loc[changed_sys_ids],
+            )
+            if self.verify_aggregates and not self.check_rob_aggregates(
+                self.df_new_rob_aggregates, df_new_rob_historicized
+            ):
+                raise ValueError(
+                    "The incrementally updated aggregates do not match the aggregates of the historicized data."
+                )
 
-        # Write `self.df_new_finding_places` and `self.df_new_rob_historicized` to storage
+        # Write `self.df_new_finding_places`, `self.df_new_rob_historicized`, `self.df_new_rob_current`,
+        # `self.df_new_rob_lifecycle` and `self.df_new_rob_aggregates` to storage
         # S3
         self._write_csv(
             self.df_new_finding_places,
@@ -519,17 +1909,39 @@ class RobHistoricizer(ABC):
                 [self.path_to_interim_data, "catalogued_finding_places.csv"]
             ),
         )
+        if self.memory_limit_mb is None:
+            self._write_csv(self.df_new_rob_historicized, self.path_to_rob)
+        else:
+            self._write_rob_historicized_in_chunks(df_new_rob_historicized)
+        self._write_csv(
+            self.df_new_rob_current.reset_index(),
+            self.path_join.join([self.path_to_deployment_data, "rob_current.csv"]),
+        )
+        self._write_csv(
+            self.df_new_rob_lifecycle.reset_index(),
+            self.path_join.join([self.path_to_deployment_data, "rob_lifecycle.csv"]),
+        )
         self._write_csv(
-            self.df_new_rob_historicized,
-            self.path_join.join([self.path_to_deployment_data, "rob.csv"]),
+            self.df_new_rob_aggregates,
+            self.path_join.join([self.path_to_deployment_data, "rob_aggregates.csv"]),
         )
         # local (for clearml versioning)
         self.df_new_finding_places.to_csv(
-            os.path.join(PATH_TO_OUT, "catalogued_finding_places.csv"),
+            os.path.join(self.path_to_out, "catalogued_finding_places.csv"),
             index=False,
         )
-        self.df_new_rob_historicized.to_csv(
-            os.path.join(PATH_TO_OUT, "rob.csv"), index=False
+        if self.memory_limit_mb is None:
+            self.df_new_rob_historicized.to_csv(
+                os.path.join(self.path_to_out, "rob.csv"), index=False
+            )
+        self.df_new_rob_current.to_csv(
+            os.path.join(self.path_to_out, "rob_current.csv")
+        )
+        self.df_new_rob_lifecycle.to_csv(
+            os.path.join(self.path_to_out, "rob_lifecycle.csv")
+        )
+        self.df_new_rob_aggregates.to_csv(
+            os.path.join(self.path_to_out, "rob_aggregates.csv"), index=False
         )
 
         # Update changelogs
@@ -559,11 +1971,23 @@ class RobHistoricizer(ABC):
 
 
 class RobHistoricizerAWS(RobHistoricizer):
-    def __init__(self):
+    def __init__(
+        self,
+        memory_limit_mb: Optional[float] = None,
+        verify_aggregates: bool = False,
+    ):
         """
         Initializes an instance of class `RobHistoricizerAWS`. That is, sets up all pre-requisites to access and write
         to the S3-bucket (https://s3.console.aws.amazon.com/s3/buckets/rob-oliver) and historicize data about rescued
         seal pups of the Seehundstation Friedrichskoog.
+
+        Parameters
+        ----------
+        memory_limit_mb
+            Approximate memory ceiling in megabytes for processing `rob.csv`, see `RobHistoricizer`.
+
+        verify_aggregates
+            Whether to check the incrementally updated aggregates on each update, see `RobHistoricizer`.
         """
         # AWS credentials
         aws_access_key_id, aws_secret_access_key = self._get_aws_login()
@@ -575,6 +1999,9 @@ class RobHistoricizerAWS(RobHistoricizer):
         )
         # S3 bucket
         self.s3_bucket = "rob-oliver"
+        # Background worker to upload clearml dataset versions
+        self._clearml_executor = ThreadPoolExecutor(max_workers=1)
+        self.clearml_future = None
         # S3 folder paths and path join
         super().__init__(
             path_to_raw_data="data/raw",
@@ -582,6 +2009,8 @@ class RobHistoricizerAWS(RobHistoricizer):
             path_to_interim_data="data/interim",
             path_to_deployment_data="data/deployment",
             path_join="/",
+            memory_limit_mb=memory_limit_mb,
+            verify_aggregates=verify_aggregates,
         )
 
     @staticmethod
@@ -611,9 +2040,113 @@ class RobHistoricizerAWS(RobHistoricizer):
             Key=self.path_join.join([self.path_to_changelogs, changelog_name]),
         )
 
+    def _csv_exists(self, path_to_csv: str) -> bool:
+        try:
+            self.s3_client.head_object(Bucket=self.s3_bucket, Key=path_to_csv)
+        except botocore.exceptions.ClientError as error:
+            if error.response["Error"]["Code"] in ["404", "NoSuchKey"]:
+                return False
+            print(error)
+            raise
+        return True
+
+    @staticmethod
+    def _get_path_to_cache(path_to_csv: str) -> Tuple[str, str]:
+        """
+        Returns the local paths to the cached copy of the object `path_to_csv` and to its ETag in `PATH_TO_CACHE`.
+        """
+        path_to_cached_csv = os.path.join(PATH_TO_CACHE, path_to_csv.replace("/", "__"))
+        return path_to_cached_csv, path_to_cached_csv + ".etag"
+
+    def _get_cached_csv(self, path_to_csv: str) -> str:
+        """
+        Returns the path to a local copy of the object `path_to_csv` in the S3 bucket. The copy is kept in
+        `PATH_TO_CACHE` together with the ETag of the object, and is only downloaded again if the ETag has changed.
+
+        Parameters
+        ----------
+        path_to_csv
+            A key of a csv-file in the S3 bucket.
+
+        Returns
+        -------
+        A local path to the csv-file, which may be gzip-compressed.
+        """
+        path_to_cached_csv, path_to_etag = self._get_path_to_cache(path_to_csv)
+        conditions = {}
+        if os.path.exists(path_to_cached_csv) and os.path.exists(path_to_etag):
+            with open(path_to_etag) as etag_file:
+                conditions["IfNoneMatch"] = etag_file.read()
+
+        try:
+            s3_obj = self.s3_client.get_object(
+                Bucket=self.s3_bucket, Key=path_to_csv, **conditions
+            )
+        except botocore.exceptions.ClientError as error:
+            if error.response["ResponseMetadata"]["HTTPStatusCode"] == 304:
+                # The object has not changed since it was cached
+                return path_to_cached_csv
+            print(error)
+            raise
+
+        os.makedirs(PATH_TO_CACHE, exist_ok=True)
+        with open(path_to_cached_csv + ".part", "wb") as binary_file:
+            for block in s3_obj["Body"].iter_chunks(chunk_size=1024**2):
+                binary_file.write(block)
+        os.replace(path_to_cached_csv + ".part", path_to_cached_csv)
+        with open(path_to_etag, "w") as etag_file:
+            etag_file.write(s3_obj["ETag"])
+        return path_to_cached_csv
+
     def _read_csv(self, path_to_csv: str) -> pd.DataFrame:
-        csv = self.s3_client.get_object(Bucket=self.s3_bucket, Key=path_to_csv)["Body"]
-        return pd.read_csv(csv)
+        path_to_cached_csv = self._get_cached_csv(path_to_csv)
+        return pd.read_csv(
+            path_to_cached_csv, compression=self._get_compression(path_to_cached_csv)
+        )
+
+    def _read_csv_chunks(
+        self, path_to_csv: str, chunksize: int, usecols: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        path_to_cached_csv = self._get_cached_csv(path_to_csv)
+        yield from pd.read_csv(
+            path_to_cached_csv,
+            compression=self._get_compression(path_to_cached_csv),
+            chunksize=chunksize,
+            usecols=usecols,
+        )
+
+    def _write_csv_chunks(
+        self, chunks: Iterable[pd.DataFrame], path_to_csv: str
+    ) -> None:
+        # Compress the chunks into a temporary file, which is then uploaded in parts. The object is stored with
+        # `Content-Encoding: gzip`, so that HTTP clients decompress it transparently.
+        with tempfile.TemporaryFile(mode="w+b") as csv_file:
+            with gzip.GzipFile(fileobj=csv_file, mode="wb") as gzip_file:
+                with io.TextIOWrapper(
+                    gzip_file, encoding="utf-8", newline=""
+                ) as text_file:
+                    for i, df_chunk in enumerate(chunks):
+                        df_chunk.to_csv(text_file, header=i == 0, index=False)
+            csv_file.seek(0)
+            self.s3_client.upload_fileobj(
+                csv_file,
+                self.s3_bucket,
+                path_to_csv,
+                ExtraArgs={"ContentType": "text/csv", "ContentEncoding": "gzip"},
+            )
+
+            # Cache the uploaded object, so that it is not downloaded again on the next run
+            path_to_cached_csv, path_to_etag = self._get_path_to_cache(path_to_csv)
+            os.makedirs(PATH_TO_CACHE, exist_ok=True)
+            csv_file.seek(0)
+            with open(path_to_cached_csv, "wb") as binary_file:
+                shutil.copyfileobj(csv_file, binary_file)
+            with open(path_to_etag, "w") as etag_file:
+                etag_file.write(
+                    self.s3_client.head_object(Bucket=self.s3_bucket, Key=path_to_csv)[
+                        "ETag"
+                    ]
+                )
 
     def _get_rob_raw(self, changelog_name) -> io.BytesIO:
         try:
@@ -633,38 +2166,133 @@ class RobHistoricizerAWS(RobHistoricizer):
             raise
 
     def _write_csv(self, df: pd.DataFrame, path_to_csv: str) -> None:
-        csv_buffer = io.StringIO()
-        df.to_csv(csv_buffer, index=False)
-        self.s3_client.put_object(
-            Body=csv_buffer.getvalue(), Bucket=self.s3_bucket, Key=path_to_csv
-        )
+        self._write_csv_chunks([df], path_to_csv)
+
+    @staticmethod
+    def _compute_file_hash(path_to_file: str) -> str:
+        """
+        Computes the `sha256`-value of the content of the file stored in `path_to_file`, reading it block by block.
+
+        Parameters
+        ----------
+        path_to_file
+            A path to a file.
+
+        Returns
+        -------
+        The hexadecimal `sha256`-value.
+        """
+        file_hash = sha256()
+        with open(path_to_file, "rb") as binary_file:
+            for block in iter(lambda: binary_file.read(1024**2), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
 
     @staticmethod
-    def _add_to_clearml_dataset() -> None:
+    def _add_to_clearml_dataset(path_to_out: str = PATH_TO_OUT) -> Dict:
         """
         Adds the dataset historicized in `self.update_rob` to a clearml dataset
         (https://clear.ml/docs/latest/docs/references/sdk/dataset/). Clearml datasets are tracked by version, i.e., we
         can restore previous versions of the dataset.
 
+        The files in `path_to_out` are compared by their `sha256`-value with the files of the latest version. Only
+        changed files are added to the new version, which inherits all other files from the latest version. If no file
+        has changed, no new version is created.
+
+        Parameters
+        ----------
+        path_to_out
+            Path to the local folder the result files have been saved to, see `RobHistoricizer`.
+
         Returns
         -------
-        None
+        A dictionary with keys `dataset_id` (`None` if no version was created), `num_files`, `num_bytes` and `seconds`
+        describing the upload.
         """
+        start = time.perf_counter()
+        parent_dataset = Dataset.get(
+            dataset_project=PROJECT_NAME, dataset_name=DATASET_NAME
+        )
+        parent_hashes = {
+            dataset_path: file_entry.hash
+            for dataset_path, file_entry in parent_dataset.file_entries_dict.items()
+        }
+        local_hashes = {
+            os.path.relpath(path, path_to_out).replace(
+                os.path.sep, "/"
+            ): RobHistoricizerAWS._compute_file_hash(path)
+            for path in glob.glob(os.path.join(path_to_out, "**", "*"), recursive=True)
+            if os.path.isfile(path)
+        }
+        changed_files = [
+            dataset_path
+            for dataset_path, file_hash in local_hashes.items()
+            if parent_hashes.get(dataset_path) != file_hash
+        ]
+        removed_files = [
+            dataset_path
+            for dataset_path in parent_hashes
+            if dataset_path not in local_hashes
+        ]
+
+        report = {
+            "dataset_id": None,
+            "num_files": 0,
+            "num_bytes": 0,
+            "seconds": time.perf_counter() - start,
+        }
+        if len(changed_files) == 0 and len(removed_files) == 0:
+            print(
+                f"No changes with respect to clearml dataset {parent_dataset.id}. Skipping versioning."
+            )
+            return report
 
         dataset = Dataset.create(
             dataset_name=DATASET_NAME,
             dataset_project=PROJECT_NAME,
-            parent_datasets=[
-                Dataset.get(dataset_project=PROJECT_NAME, dataset_name=DATASET_NAME).id
-            ],
+            parent_datasets=[parent_dataset.id],
         )
 
-        # Sync local folder
-        dataset.sync_folder(local_path=os.path.join(PATH_TO_OUT))
+        # Add changed files and remove deleted files
+        for dataset_path in removed_files:
+            dataset.remove_files(dataset_path=dataset_path)
+        for dataset_path in changed_files:
+            dataset.add_files(
+                path=os.path.join(path_to_out, dataset_path),
+                dataset_path=os.path.dirname(dataset_path) or None,
+            )
 
         # Finalize and upload the data
         dataset.finalize(auto_upload=True)
 
+        report.update(
+            dataset_id=dataset.id,
+            num_files=len(changed_files),
+            num_bytes=sum(
+                os.path.getsize(os.path.join(path_to_out, dataset_path))
+                for dataset_path in changed_files
+            ),
+            seconds=time.perf_counter() - start,
+        )
+        print(
+            f"Created clearml dataset version {report['dataset_id']}: uploaded {report['num_files']} changed files "
+            f"({report['num_bytes']} bytes) in {report['seconds']:.1f} s."
+        )
+        return report
+
+    @staticmethod
+    def _report_clearml_upload(clearml_future: Future) -> None:
+        """
+        Prints the error if the background upload to the clearml dataset in `clearml_future` has failed, so that it
+        does not go unnoticed if nobody waits for the upload.
+        """
+        if clearml_future.cancelled():
+            print("The upload to the clearml dataset was cancelled.")
+        elif clearml_future.exception() is not None:
+            print(
+                f"The upload to the clearml dataset has failed: {clearml_future.exception()!r}"
+            )
+
     def update_rob(self) -> None:
         """
         Updates  `self.df_new_rob_historicized`. That is,
@@ -672,23 +2300,43 @@ class RobHistoricizerAWS(RobHistoricizer):
         2. Corrects spelling mistakes in the names of finding places in the raw data and adds geo-coordinates
         3. Updates the catalogued finding places
         4. Saves the cleaned input data and catalogued finding places to the local file system
-        4. Creates a new version of the cleaned input data and catalogued finding places on clear-ml (https://clear.ml/)
+        4. Starts creating a new version of the cleaned input data and catalogued finding places on clear-ml
+           (https://clear.ml/) in the background. Callers that need the new version must wait for the upload with
+           `self.clearml_future.result()`, which returns the report of `_add_to_clearml_dataset` or re-raises its
+           error. Errors are printed in any case.
 
         Returns
         -------
         None
         """
         super().update_rob()
+        if self.df_new_rob_current is None:  # Nothing has been updated
+            return
 
         # Version `df_new_finding_places` and `df_new_rob_historicized` in a clearml (https://clear.ml/) dataset
-        self._add_to_clearml_dataset()
+        self.clearml_future = self._clearml_executor.submit(
+            self._add_to_clearml_dataset, self.path_to_out
+        )
+        self.clearml_future.add_done_callback(self._report_clearml_upload)
 
 
 class RobHistoricizerLocal(RobHistoricizer):
-    def __init__(self):
+    def __init__(
+        self,
+        memory_limit_mb: Optional[float] = None,
+        verify_aggregates: bool = False,
+    ):
         """
         Initializes an instance of class `RobHistoricizerLocal`. This class may be used to test the functionality of
         the parent class `RobHistoricizer` locally.
+
+        Parameters
+        ----------
+        memory_limit_mb
+            Approximate memory ceiling in megabytes for processing `rob.csv`, see `RobHistoricizer`.
+
+        verify_aggregates
+            Whether to check the incrementally updated aggregates on each update, see `RobHistoricizer`.
         """
         # Local paths to data
         path_to_raw_data = os.path.join("..", "data", "local", "raw")
@@ -749,6 +2397,8 @@ class RobHistoricizerLocal(RobHistoricizer):
             path_to_interim_data=path_to_interim_data,
             path_to_deployment_data=path_to_deployment_data,
             path_join=os.path.sep,
+            memory_limit_mb=memory_limit_mb,
+            verify_aggregates=verify_aggregates,
         )
 
     def _get_changelogs(self) -> List[str]:
@@ -771,22 +2421,198 @@ class RobHistoricizerLocal(RobHistoricizer):
             rob_raw = io.BytesIO(binary_file.read())
         return rob_raw
 
+    def _csv_exists(self, path_to_csv: str) -> bool:
+        return os.path.exists(path_to_csv)
+
     def _read_csv(self, path_to_csv: str) -> pd.DataFrame:
-        return pd.read_csv(path_to_csv)
+        return pd.read_csv(path_to_csv, compression=self._get_compression(path_to_csv))
+
+    def _read_csv_chunks(
+        self, path_to_csv: str, chunksize: int, usecols: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        yield from pd.read_csv(
+            path_to_csv,
+            compression=self._get_compression(path_to_csv),
+            chunksize=chunksize,
+            usecols=usecols,
+        )
+
+    def _write_csv_chunks(
+        self, chunks: Iterable[pd.DataFrame], path_to_csv: str
+    ) -> None:
+        for i, df_chunk in enumerate(chunks):
+            df_chunk.to_csv(
+                path_to_csv, mode="w" if i == 0 else "a", header=i == 0, index=False
+            )
 
     @staticmethod
     def _write_csv(df: pd.DataFrame, path_to_csv: str) -> None:
         df.to_csv(path_to_csv)
 
 
+class RobHistoricizerMemory(RobHistoricizer):
+    def __init__(
+        self,
+        objects: Optional[Dict[str, Union[bytes, pd.DataFrame]]] = None,
+        path_to_fixtures: Optional[str] = None,
+        memory_limit_mb: Optional[float] = None,
+        verify_aggregates: bool = False,
+        path_to_out: Optional[str] = None,
+        review: Optional[Callable[[pd.DataFrame], Dict[str, pd.DataFrame]]] = None,
+    ):
+        """
+        Initializes an instance of class `RobHistoricizerMemory`. This class keeps all data in an in-memory object store
+        with the same key layout as the S3 bucket (https://s3.console.aws.amazon.com/s3/buckets/rob-oliver), i.e.,
+        `data/raw`, `data/changelog`, `data/interim` and `data/deployment`. It does not access any external service, so
+        that the functionality of the parent class `RobHistoricizer` can be run and profiled offline. With raw pdf files
+        seeded as `pandas DataFrames` and a `review` callable, `update_rob` also runs without parsing pdf files and
+        without the `PandasGui`.
+
+        Parameters
+        ----------
+        objects
+            Objects to seed the store with, by key, e.g., "data/deployment/rob.csv". Values are either the raw, possibly
+            gzip-compressed content of a file, or a `pandas DataFrame` which is stored as a csv-file. `pandas
+            DataFrames` seeded as raw pdf files, e.g., "data/raw/20230101_1.6HomepageHeuler.pdf", are kept as they are
+            and taken to be already parsed, see `read_rob_raw`.
+
+        path_to_fixtures
+            Path to a local folder to seed the store with. It must have the same layout as the folder written by
+            `RobHistoricizerLocal`, i.e., subfolders `raw`, `changelog`, `interim` and `deployment`. Gzip-compressed
+            files are decompressed. Objects in `objects` take precedence.
+
+        memory_limit_mb
+            Approximate memory ceiling in megabytes for processing `rob.csv`, see `RobHistoricizer`.
+
+        verify_aggregates
+            Whether to check the incrementally updated aggregates on each update, see `RobHistoricizer`.
+
+        path_to_out
+            Path to a local folder to which the result files are saved for versioning, see `RobHistoricizer`. If
+            `None`, a temporary folder owned by the instance is used, which is removed with the instance.
+
+        review
+            A function that reviews the cleaned input data in place of the `PandasGui`, e.g., `accept_rob_cleaned`. It
+            is given a `pandas DataFrame` of cleaned input data with suggested finding places, and returns a dictionary
+            with keys `df_rob_manually_corrected` and `df_new_finding_places`. If `None`, the `PandasGui` is shown.
+        """
+        self.objects = {}
+        self.review = review
+        if path_to_out is None:
+            self.out_directory = tempfile.TemporaryDirectory()
+            path_to_out = self.out_directory.name
+
+        # Seed the object store
+        if path_to_fixtures is not None:
+            for folder in ["raw", "changelog", "interim", "deployment"]:
+                for path in glob.glob(os.path.join(path_to_fixtures, folder, "*")):
+                    with open(path, "rb") as binary_file:
+                        self.objects[
+                            "/".join(["data", folder, os.path.basename(path)])
+                        ] = self._decompress(binary_file.read())
+        for key, value in (objects or {}).items():
+            if isinstance(value, pd.DataFrame) and key.startswith("data/raw/"):
+                self.objects[key] = value
+            elif isinstance(value, pd.DataFrame):
+                self._write_csv(value, key)
+            else:
+                self.objects[key] = self._decompress(value)
+
+        super().__init__(
+            path_to_raw_data="data/raw",
+            path_to_changelogs="data/changelog",
+            path_to_interim_data="data/interim",
+            path_to_deployment_data="data/deployment",
+            path_join="/",
+            memory_limit_mb=memory_limit_mb,
+            verify_aggregates=verify_aggregates,
+            path_to_out=path_to_out,
+        )
+
+    @staticmethod
+    def _decompress(content: bytes) -> bytes:
+        """
+        Decompresses `content` if it is gzip-compressed, e.g., a csv-file downloaded from S3 by `RobHistoricizerLocal`,
+        so that all objects in the store are held uncompressed.
+        """
+        return gzip.decompress(content) if content[:2] == b"\x1f\x8b" else content
+
+    def _get_changelogs(self) -> List[str]:
+        return [
+            os.path.basename(key)
+            for key in self.objects
+            if key.startswith(self.path_to_changelogs + "/")
+            and os.path.basename(key) != ""
+        ]
+
+    def _delete_changelog(self, changelog_name: str) -> None:
+        self.objects.pop(
+            self.path_join.join([self.path_to_changelogs, changelog_name]), None
+        )
+
+    def _get_rob_raw(self, changelog_name: str) -> Union[io.BytesIO, pd.DataFrame]:
+        rob_raw = self.objects[
+            self.path_join.join([self.path_to_raw_data, changelog_name[:-3] + "pdf"])
+        ]
+        return rob_raw if isinstance(rob_raw, pd.DataFrame) else io.BytesIO(rob_raw)
+
+    @staticmethod
+    def read_rob_raw(pdf_file: Union[io.BytesIO, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Reads the raw pdf file `pdf_file`, see `RobHistoricizer.read_rob_raw`. Raw pdf files seeded as `pandas
+        DataFrames` are returned as they are.
+        """
+        if isinstance(pdf_file, pd.DataFrame):
+            return pdf_file
+        return RobHistoricizer.read_rob_raw(pdf_file)
+
+    def _review_rob_cleaned(
+        self, df_rob_cleaned: pd.DataFrame
+    ) -> Dict[str, pd.DataFrame]:
+        if self.review is None:
+            return super()._review_rob_cleaned(df_rob_cleaned)
+        return self.review(df_rob_cleaned)
+
+    def _csv_exists(self, path_to_csv: str) -> bool:
+        return path_to_csv in self.objects
+
+    def _read_csv(self, path_to_csv: str) -> pd.DataFrame:
+        return pd.read_csv(io.BytesIO(self.objects[path_to_csv]))
+
+    def _read_csv_chunks(
+        self, path_to_csv: str, chunksize: int, usecols: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        yield from pd.read_csv(
+            io.BytesIO(self.objects[path_to_csv]), chunksize=chunksize, usecols=usecols
+        )
+
+    def _write_csv_chunks(
+        self, chunks: Iterable[pd.DataFrame], path_to_csv: str
+    ) -> None:
+        csv_buffer = io.StringIO()
+        for i, df_chunk in enumerate(chunks):
+            df_chunk.to_csv(csv_buffer, header=i == 0, index=False)
+        self.objects[path_to_csv] = csv_buffer.getvalue().encode("utf-8")
+
+    def _write_csv(self, df: pd.DataFrame, path_to_csv: str) -> None:
+        self._write_csv_chunks([df], path_to_csv)
+
+
 if __name__ == "__main__":
-    historicizer_class = ["aws", "local"][0]
+    historicizer_class = ["aws", "local", "memory"][0]
     if historicizer_class == "aws":
         rob_historicizer = RobHistoricizerAWS()
     elif historicizer_class == "local":
         rob_historicizer = RobHistoricizerLocal()
+    elif historicizer_class == "memory":
+        rob_historicizer = RobHistoricizerMemory(
+            path_to_fixtures=os.path.join("..", "data", "local")
+        )
     else:
         raise ValueError(
-            f"Invalid `historicizer_class` {historicizer_class}. Choose in `['aws', 'local']`."
+            f"Invalid `historicizer_class` {historicizer_class}. Choose in `['aws', 'local', 'memory']`."
         )
     rob_historicizer.update_rob()
+    if historicizer_class == "aws" and rob_historicizer.clearml_future is not None:
+        # Wait for the clearml dataset version to be uploaded in the background
+        rob_historicizer.clearml_future.result()
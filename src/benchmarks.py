@@ -0,0 +1,532 @@
+"""
+Benchmarks of the performance-critical routines in `RobHistoricizer.py` on synthetic data, each against the
+straightforward implementation it replaces. Run from the `src` folder with `python benchmarks.py`.
+"""
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from typing import Callable, Dict, Tuple
+from RobHistoricizer import (
+    FindingPlaceIndex,
+    RobHistoricizer,
+    RobHistoricizerMemory,
+    ValidityIndex,
+    accept_rob_cleaned,
+    FINDING_PLACE_DUPLICATE_RADIUS_KM,
+    ROB_COLUMNS,
+    ROB_STATUSES,
+)
+
+SEED = 42
+NUM_REPEATS = 3
+NUM_FINDING_PLACES = 20000
+NUM_LOCATION_QUERIES = 1000
+NUM_ANIMALS = 20000
+NUM_YEARS = 6
+START_DATE = "2017-01-01"
+AS_OF_FREQUENCY = "14D"
+NUM_ANIMALS_CLEANED = 1000
+NUM_PDF_FILES = 6
+PDF_FREQUENCY = "7D"
+MEMORY_LIMIT_MB = 0.1
+# Bounding box of the coast of Schleswig-Holstein and Lower Saxony, where the animals are found
+LAT_RANGE = (53.3, 55.1)
+LONG_RANGE = (7.9, 9.0)
+
+
+def measure_seconds(
+    function: Callable, *args, num_repeats: int = NUM_REPEATS
+) -> Tuple[float, object]:
+    """
+    Runs `function(*args)` `num_repeats` times.
+
+    Parameters
+    ----------
+    function
+        The function to benchmark.
+
+    args
+        Arguments to pass to `function`.
+
+    num_repeats
+        Number of runs.
+
+    Returns
+    -------
+    A tuple of the fastest run time in seconds and the return value of `function`.
+    """
+    seconds = []
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        seconds.append(time.perf_counter() - start)
+    return min(seconds), result
+
+
+def measure_peak_memory(function: Callable, *args) -> float:
+    """
+    Runs `function(*args)` once and traces the memory allocated by Python meanwhile with `tracemalloc`.
+
+    Parameters
+    ----------
+    function
+        The function to benchmark.
+
+    args
+        Arguments to pass to `function`.
+
+    Returns
+    -------
+    The peak of the traced memory in megabytes.
+    """
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1] / 1024**2
+    finally:
+        tracemalloc.stop()
+
+
+def generate_finding_places(num_places: int, seed: int = SEED) -> pd.DataFrame:
+    """
+    Generates finding places with random coordinates along the coast, see `LAT_RANGE` and `LONG_RANGE`.
+
+    Parameters
+    ----------
+    num_places
+        Number of finding places.
+
+    seed
+        Seed of the random number generator.
+
+    Returns
+    -------
+    A `pandas DataFrame` with columns `Name`, `Lat` and `Long`, like `catalogued_finding_places.csv`.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "Name": [f"Fundort {i}" for i in range(num_places)],
+            "Lat": rng.uniform(*LAT_RANGE, num_places),
+            "Long": rng.uniform(*LONG_RANGE, num_places),
+        }
+    )
+
+
+def generate_rob_historicized(
+    num_animals: int, num_years: int = NUM_YEARS, seed: int = SEED
+) -> pd.DataFrame:
+    """
+    Generates historicized data about rescued seal pups. Each animal is reported in rehabilitation a few days after
+    its admission, and most animals are reported as released or deceased some weeks later.
+
+    Parameters
+    ----------
+    num_animals
+        Number of animals.
+
+    num_years
+        Number of years since `START_DATE` over which the admission dates are spread.
+
+    seed
+        Seed of the random number generator.
+
+    Returns
+    -------
+    A `pandas DataFrame` with columns `ROB_COLUMNS`, like `rob.csv`.
+    """
+    rng = np.random.default_rng(seed)
+    df_places = generate_finding_places(50, seed)
+    place_positions = rng.integers(len(df_places), size=num_animals)
+    admission_dates = pd.Timestamp(START_DATE) + pd.to_timedelta(
+        rng.integers(365 * num_years, size=num_animals), unit="D"
+    )
+    df_admissions = pd.DataFrame(
+        {
+            "Sys_id": [f"{i:064x}" for i in range(num_animals)],
+            "Fundort": df_places["Name"].to_numpy()[place_positions],
+            "Lat": df_places["Lat"].to_numpy()[place_positions],
+            "Long": df_places["Long"].to_numpy()[place_positions],
+            "Einlieferungsdatum": admission_dates,
+            "Tierart": rng.choice(["Seehund", "Kegelrobbe", "sonstige"], num_animals),
+            "Aktuell": ROB_STATUSES[0],
+            "Erstellt_am": admission_dates.tz_localize("UTC")
+            + pd.to_timedelta(rng.integers(5, size=num_animals), unit="D"),
+        }
+    )
+    is_discharged = rng.random(num_animals) < 0.8
+    df_discharges = df_admissions.loc[is_discharged].assign(
+        Aktuell=rng.choice(ROB_STATUSES[1:], is_discharged.sum()),
+        Erstellt_am=lambda df: df["Erstellt_am"]
+        + pd.to_timedelta(rng.integers(20, 120, size=len(df)), unit="D"),
+    )
+    df_rob = pd.concat([df_admissions, df_discharges], ignore_index=True)
+    return df_rob.assign(
+        Sys_aktualisiert_am=df_rob["Erstellt_am"] + pd.Timedelta(hours=1),
+        Sys_hash=df_rob["Sys_id"] + df_rob["Aktuell"],
+    )[ROB_COLUMNS]
+
+
+def benchmark_finding_place_index(
+    num_places: int = NUM_FINDING_PLACES, num_queries: int = NUM_LOCATION_QUERIES
+) -> None:
+    """
+    Compares radius and nearest-neighbor queries of `FindingPlaceIndex` with computing the haversine distances to all
+    finding places, and checks that both return the same finding places.
+
+    Parameters
+    ----------
+    num_places
+        Number of indexed finding places.
+
+    num_queries
+        Number of query locations.
+
+    Returns
+    -------
+    None
+    """
+    df_places = generate_finding_places(num_places)
+    df_queries = generate_finding_places(num_queries, seed=SEED + 1)
+    queries = list(zip(df_queries["Lat"], df_queries["Long"]))
+
+    seconds_build, index = measure_seconds(FindingPlaceIndex, df_places)
+
+    def query_radius_grid():
+        return [
+            index.query_radius(lat, long, FINDING_PLACE_DUPLICATE_RADIUS_KM)[0]
+            for lat, long in queries
+        ]
+
+    def query_radius_brute_force():
+        return [
+            np.flatnonzero(
+                FindingPlaceIndex.haversine(lat, long, index.lat, index.long)
+                <= FINDING_PLACE_DUPLICATE_RADIUS_KM
+            )
+            for lat, long in queries
+        ]
+
+    def query_nearest_grid():
+        return [index.query_nearest(lat, long)[0][0] for lat, long in queries]
+
+    def query_nearest_brute_force():
+        return [
+            np.argmin(FindingPlaceIndex.haversine(lat, long, index.lat, index.long))
+            for lat, long in queries
+        ]
+
+    seconds_radius_grid, radius_grid = measure_seconds(query_radius_grid)
+    seconds_radius_brute, radius_brute = measure_seconds(query_radius_brute_force)
+    seconds_nearest_grid, nearest_grid = measure_seconds(query_nearest_grid)
+    seconds_nearest_brute, nearest_brute = measure_seconds(query_nearest_brute_force)
+    assert all(
+        np.array_equal(np.sort(grid), brute)
+        for grid, brute in zip(radius_grid, radius_brute)
+    )
+    assert nearest_grid == nearest_brute
+
+    print(
+        f"FindingPlaceIndex ({num_places} finding places, {num_queries} queries): built in {seconds_build:.3f} s\n"
+        f"  radius {FINDING_PLACE_DUPLICATE_RADIUS_KM} km: grid {seconds_radius_grid:.3f} s, brute force "
+        f"{seconds_radius_brute:.3f} s\n"
+        f"  nearest neighbor: grid {seconds_nearest_grid:.3f} s, brute force {seconds_nearest_brute:.3f} s"
+    )
+
+
+def benchmark_validity_index(
+    num_animals: int = NUM_ANIMALS, frequency: str = AS_OF_FREQUENCY
+) -> None:
+    """
+    Compares counting the animals by status as of each date with `ValidityIndex` with filtering, sorting and
+    deduplicating the whole history for each date, and checks that both return the same counts.
+
+    Parameters
+    ----------
+    num_animals
+        Number of animals in the history.
+
+    frequency
+        Frequency of the dates to count at, e.g., "14D".
+
+    Returns
+    -------
+    None
+    """
+    df_rob = generate_rob_historicized(num_animals)
+    dates = pd.date_range(
+        df_rob["Erstellt_am"].min(), df_rob["Erstellt_am"].max(), freq=frequency
+    )
+
+    def count_per_date():
+        return (
+            pd.DataFrame(
+                {
+                    date: df_rob.loc[df_rob["Erstellt_am"] <= date]
+                    .sort_values(by=["Erstellt_am", "Sys_aktualisiert_am"])
+                    .drop_duplicates(subset="Sys_id", keep="last")["Aktuell"]
+                    .value_counts()
+                    for date in dates
+                }
+            )
+            .T.fillna(0)
+            .astype("int64")
+        )
+
+    seconds_build, index = measure_seconds(ValidityIndex, df_rob)
+    seconds_index, counts_index = measure_seconds(index.count, dates, "Aktuell")
+    seconds_per_date, counts_per_date = measure_seconds(count_per_date)
+    assert np.array_equal(
+        counts_index.to_numpy(), counts_per_date[counts_index.columns].to_numpy()
+    )
+
+    print(
+        f"ValidityIndex ({len(df_rob)} versions of {num_animals} animals, {len(dates)} dates): built in "
+        f"{seconds_build:.3f} s\n"
+        f"  count as of: index {seconds_index:.3f} s, per date {seconds_per_date:.3f} s"
+    )
+
+
+def generate_rob_cleaned(
+    num_animals: int, num_pdf_files: int = NUM_PDF_FILES, seed: int = SEED
+) -> pd.DataFrame:
+    """
+    Generates cleaned input data about rescued seal pups as read from `num_pdf_files` raw pdf files, which are created
+    every `PDF_FREQUENCY` and each list all animals admitted so far with their status at the time.
+
+    Parameters
+    ----------
+    num_animals
+        Number of animals.
+
+    num_pdf_files
+        Number of raw pdf files.
+
+    seed
+        Seed of the random number generator.
+
+    Returns
+    -------
+    A `pandas DataFrame` with columns `Fundort`, `Lat`, `Long`, `Einlieferungsdatum`, `Tierart`, `Aktuell` and
+    `Erstellt_am`, like `RobHistoricizer.df_rob_cleaned`.
+    """
+    df_rob = generate_rob_historicized(num_animals, seed=seed)
+    creation_dates = pd.date_range(
+        end=df_rob["Erstellt_am"].max(), periods=num_pdf_files, freq=PDF_FREQUENCY
+    )
+    return (
+        ValidityIndex(df_rob)
+        .query(creation_dates)
+        .assign(Erstellt_am=lambda df: df["Stichtag"])[
+            [
+                "Fundort",
+                "Lat",
+                "Long",
+                "Einlieferungsdatum",
+                "Tierart",
+                "Aktuell",
+                "Erstellt_am",
+            ]
+        ]
+    )
+
+
+def historicize_rob_reference(rob_historicizer: RobHistoricizer) -> pd.DataFrame:
+    """
+    The implementation of `RobHistoricizer.historicize_rob` before it was reworked into a single pass: it copies
+    `df_rob_cleaned`, hashes each row separately and keeps the earliest entry per `Sys_hash` with a groupby. Instead of
+    terminating the program, it returns an empty `pandas DataFrame` if nothing has changed.
+
+    Parameters
+    ----------
+    rob_historicizer
+        An instance of `RobHistoricizer` with `df_rob_cleaned` set.
+
+    Returns
+    -------
+    A `pandas Dataframe` that holds novel, cleaned input data about rescued seal pups.
+    """
+    df_rob_new = rob_historicizer.df_rob_cleaned.copy()
+
+    df_rob_new["Sys_id"] = rob_historicizer._compute_hash(
+        df_rob_new.assign(
+            Count=(
+                df_rob_new.groupby(
+                    [
+                        "Fundort",
+                        "Einlieferungsdatum",
+                        "Tierart",
+                        "Erstellt_am",
+                    ]  # Group
+                ).cumcount()
+            )
+        )[
+            ["Count", "Fundort", "Einlieferungsdatum", "Tierart"]
+        ]  # Unique identifier
+    )
+    df_rob_new["Sys_hash"] = rob_historicizer._compute_hash(
+        df_rob_new[["Sys_id", "Aktuell"]]
+    )
+
+    df_rob_new = (
+        df_rob_new.sort_values(["Sys_hash", "Erstellt_am"])
+        .groupby("Sys_hash")
+        .first()
+        .reset_index()
+    )
+
+    entry_exists = rob_historicizer._find_existing_hashes(df_rob_new["Sys_hash"])
+    if entry_exists.all():
+        return df_rob_new.iloc[:0]
+
+    return df_rob_new[~entry_exists].assign(
+        Sys_aktualisiert_am=datetime.now(timezone.utc)
+    )
+
+
+def benchmark_historicize_rob(num_animals: int = NUM_ANIMALS_CLEANED) -> None:
+    """
+    Compares the run time and peak memory of `RobHistoricizer.historicize_rob` with `historicize_rob_reference` on an
+    empty history, and checks that both return the same entries.
+
+    Parameters
+    ----------
+    num_animals
+        Number of animals in the raw pdf files.
+
+    Returns
+    -------
+    None
+    """
+    rob_historicizer = RobHistoricizerMemory(
+        objects={
+            "data/interim/catalogued_finding_places.csv": generate_finding_places(50),
+            "data/deployment/rob.csv": pd.DataFrame(columns=ROB_COLUMNS),
+        }
+    )
+    rob_historicizer.df_rob_cleaned = generate_rob_cleaned(num_animals)
+
+    seconds_new, df_rob_new = measure_seconds(
+        rob_historicizer.historicize_rob, num_repeats=1
+    )
+    seconds_reference, df_rob_reference = measure_seconds(
+        historicize_rob_reference, rob_historicizer, num_repeats=1
+    )
+    peak_mb_new = measure_peak_memory(rob_historicizer.historicize_rob)
+    peak_mb_reference = measure_peak_memory(historicize_rob_reference, rob_historicizer)
+    df_rob_new = df_rob_new.drop(columns="Sys_aktualisiert_am").set_index("Sys_hash")
+    df_rob_reference = df_rob_reference.drop(columns="Sys_aktualisiert_am").set_index(
+        "Sys_hash"
+    )
+    assert df_rob_new.sort_index().equals(
+        df_rob_reference[df_rob_new.columns].sort_index()
+    )
+
+    print(
+        f"historicize_rob ({len(rob_historicizer.df_rob_cleaned)} cleaned entries of {num_animals} animals in "
+        f"{NUM_PDF_FILES} pdf files, {len(df_rob_new)} novel entries):\n"
+        f"  new {seconds_new:.3f} s, peak {peak_mb_new:.1f} MB; reference {seconds_reference:.3f} s, peak "
+        f"{peak_mb_reference:.1f} MB"
+    )
+
+
+def generate_rob_raw(
+    num_animals: int, num_pdf_files: int = NUM_PDF_FILES, seed: int = SEED
+) -> Dict[str, pd.DataFrame]:
+    """
+    Generates raw pdf files as parsed by `RobHistoricizer.read_rob_raw`, see `generate_rob_cleaned`.
+
+    Parameters
+    ----------
+    num_animals
+        Number of animals.
+
+    num_pdf_files
+        Number of raw pdf files.
+
+    seed
+        Seed of the random number generator.
+
+    Returns
+    -------
+    A dictionary of `pandas DataFrames` with columns `Fundort`, `Einlieferungsdatum`, `Tierart`, `Aktuell` and
+    `Erstellt_am` by file name, e.g., "20230101_1.6HomepageHeuler.pdf".
+    """
+    return {
+        f"{creation_date:%Y%m%d}_1.6HomepageHeuler.pdf": df_rob_raw.drop(
+            columns=["Lat", "Long"]
+        ).reset_index(drop=True)
+        for creation_date, df_rob_raw in generate_rob_cleaned(
+            num_animals, num_pdf_files, seed
+        ).groupby("Erstellt_am")
+    }
+
+
+def benchmark_update_rob(num_animals: int = NUM_ANIMALS_CLEANED) -> None:
+    """
+    Runs `RobHistoricizer.update_rob` headless on `RobHistoricizerMemory`, in memory and in chunks of
+    `MEMORY_LIMIT_MB`, with the incrementally updated aggregates being checked. The first half of the raw pdf files is
+    historicized into an empty history, and the second half is added incrementally. Checks that both modes write the
+    same historicized data and aggregates.
+
+    Parameters
+    ----------
+    num_animals
+        Number of animals in the raw pdf files.
+
+    Returns
+    -------
+    None
+    """
+    rob_raw = generate_rob_raw(num_animals)
+    file_names = sorted(rob_raw)
+    batches = [file_names[: len(file_names) // 2], file_names[len(file_names) // 2 :]]
+
+    seconds, df_rob, df_rob_aggregates = {}, {}, {}
+    for memory_limit_mb in [None, MEMORY_LIMIT_MB]:
+        objects = {
+            "data/interim/catalogued_finding_places.csv": generate_finding_places(50),
+            "data/deployment/rob.csv": pd.DataFrame(columns=ROB_COLUMNS),
+        }
+        seconds[memory_limit_mb] = []
+        for batch in batches:
+            for file_name in batch:
+                objects["data/raw/" + file_name] = rob_raw[file_name]
+                objects["data/changelog/" + file_name[:-3] + "log"] = b""
+            rob_historicizer = RobHistoricizerMemory(
+                objects=objects,
+                memory_limit_mb=memory_limit_mb,
+                verify_aggregates=True,
+                review=accept_rob_cleaned,
+            )
+            start = time.perf_counter()
+            rob_historicizer.update_rob()
+            seconds[memory_limit_mb].append(time.perf_counter() - start)
+            objects = rob_historicizer.objects
+        df_rob[memory_limit_mb] = (
+            rob_historicizer._read_csv("data/deployment/rob.csv")
+            .drop(columns="Sys_aktualisiert_am")
+            .sort_values(by="Sys_hash")
+            .reset_index(drop=True)
+        )
+        df_rob_aggregates[memory_limit_mb] = rob_historicizer._read_csv(
+            "data/deployment/rob_aggregates.csv"
+        )
+    assert df_rob[None].equals(df_rob[MEMORY_LIMIT_MB])
+    assert df_rob_aggregates[None].equals(df_rob_aggregates[MEMORY_LIMIT_MB])
+
+    print(
+        f"update_rob ({num_animals} animals in {len(file_names)} pdf files, {len(df_rob[None])} historicized "
+        f"entries, in {len(batches)} updates):\n"
+        f"  in memory {' s, '.join(f'{s:.3f}' for s in seconds[None])} s; in chunks of {MEMORY_LIMIT_MB} MB "
+        f"{' s, '.join(f'{s:.3f}' for s in seconds[MEMORY_LIMIT_MB])} s"
+    )
+
+
+if __name__ == "__main__":
+    benchmark_finding_place_index()
+    benchmark_validity_index()
+    benchmark_historicize_rob()
+    benchmark_update_rob()